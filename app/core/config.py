@@ -18,9 +18,16 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5.0
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
 
     SQL_URL: str
 
+    ANSWER_KEY_CACHE_SIZE: int = 1024
+
     AUTH0_DOMAIN: str
     AUTH0_API_AUDIENCE: str
     AUTH0_ISSUER: str
@@ -28,10 +35,15 @@ class Settings(BaseSettings):
     AUTH0_CLIENT_ID: str
 
     SIGNING_KEY: str
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 100
+    TOKEN_CACHE_SIZE: int = 10000
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
+    REMINDER_INTERVAL_DAYS: int = 7
+    OUTBOX_RELAY_INTERVAL: int = 5
 
     EMAIL_HOST: str
     EMAIL_PORT: int
@@ -41,5 +53,11 @@ class Settings(BaseSettings):
 
     GMAIL_HOST: str
     GMAIL_PORT: int
+    SMTP_POOL_SIZE: int = 2
+    SMTP_TIMEOUT: float = 30.0
+    EMAIL_RATE_LIMIT_PER_SECOND: float = 10.0
+    EMAIL_RATE_LIMIT_BURST: int = 20
+    EMAIL_MAX_RETRIES: int = 3
+    EMAIL_RETRY_DELAY: int = 60
 
 settings = Settings(_env_file='../.env', _env_file_encoding='utf-8')
\ No newline at end of file
@@ -1,7 +1,89 @@
 import aioredis
+from aioredis.connection import Connection
 from app.core.config import settings
 
 
-async def get_redis_connection():
-    redis = await aioredis.from_url(url=settings.REDIS_URL, encoding="utf-8", decode_responses=True)
-    return redis
+class CountingConnectionPool(aioredis.BlockingConnectionPool):
+    """BlockingConnectionPool that keeps its own usage numbers, which aioredis does not expose."""
+
+    def reset(self):
+        self.created_connections = 0
+        self.in_use_connections: set[Connection] = set()
+        super().reset()
+
+
+    def make_connection(self):
+        self.created_connections += 1
+        return super().make_connection()
+
+
+    async def get_connection(self, command_name, *keys, **options):
+        connection = await super().get_connection(command_name, *keys, **options)
+        self.in_use_connections.add(connection)
+        return connection
+
+
+    async def release(self, connection: Connection):
+        # Also reached from get_connection when connecting fails, before the connection was counted.
+        self.in_use_connections.discard(connection)
+        await super().release(connection)
+
+
+    def get_stats(self):
+        in_use_connections = len(self.in_use_connections)
+        return {
+            "max_connections": self.max_connections,
+            "created_connections": self.created_connections,
+            "in_use_connections": in_use_connections,
+            "idle_connections": self.created_connections - in_use_connections,
+        }
+
+
+redis_pool: CountingConnectionPool | None = None
+
+
+def init_redis_pool() -> CountingConnectionPool:
+    global redis_pool
+    if redis_pool is None:
+        redis_pool = CountingConnectionPool.from_url(
+            url=settings.REDIS_URL,
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+    return redis_pool
+
+
+async def close_redis_pool():
+    global redis_pool
+    if redis_pool is not None:
+        await redis_pool.disconnect()
+        redis_pool = None
+
+
+def reset_redis_pool():
+    """Forget the pool inherited from a parent process without touching its sockets."""
+    global redis_pool
+    redis_pool = None
+
+
+def get_redis_pool() -> CountingConnectionPool:
+    if redis_pool is None:
+        raise RuntimeError("Redis pool is not initialized; call init_redis_pool() on startup")
+    return redis_pool
+
+
+async def get_redis_connection() -> aioredis.Redis:
+    return aioredis.Redis(connection_pool=get_redis_pool())
+
+
+async def get_redis() -> aioredis.Redis:
+    return await get_redis_connection()
+
+
+def get_redis_pool_stats():
+    return get_redis_pool().get_stats()
@@ -1,10 +1,15 @@
 from datetime import datetime
 
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime, Float
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime, Float, BigInteger, UniqueConstraint, Index, \
+    Sequence, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import text
 
+from app.enums.aggregate_scope import AggregateScopeEnum
 from app.enums.invite_status import InviteStatusEnum, InviteTypeEnum
 from app.enums.notification_status import NotificationStatusEnum
+from app.enums.outbox_kind import OutboxKindEnum
 from app.enums.visability import VisibilityEnum
 from app.db.base_model import Base
 from sqlalchemy.dialects.postgresql import ENUM as PgEnum
@@ -45,6 +50,11 @@ class CompanyMember(Base):
     user = relationship("User", back_populates="companies")
     company = relationship("Company", back_populates="members")
 
+    __table_args__ = (
+        Index("ix_company_members_company_id_user_id", "company_id", "user_id", postgresql_include=["role"]),
+        Index("ix_company_members_user_id_role", "user_id", "role"),
+    )
+
 
 class InviteUser(Base):
     __tablename__ = "invites"
@@ -57,6 +67,10 @@ class InviteUser(Base):
     user = relationship("User", foreign_keys=[user_id])
     company = relationship("Company")
 
+    __table_args__ = (
+        Index("ix_invites_user_id_type_invite", "user_id", "type_invite"),
+    )
+
 
 
 class Quiz(Base):
@@ -106,13 +120,110 @@ class QuizResult(Base):
     quiz = relationship("Quiz")
     company = relationship("Company")
 
+    __table_args__ = (
+        Index("ix_quiz_results_user_id_quiz_id", "user_id", "quiz_id", "solved_at"),
+        Index("ix_quiz_results_company_id_quiz_id", "company_id", "quiz_id"),
+        Index("ix_quiz_results_company_id_user_id", "company_id", "user_id"),
+    )
+
+
+# ix_quiz_last_attempts_shard_next_due_at_id is built on user_id % REMINDER_SHARDS; changing it needs a migration.
+REMINDER_SHARDS = 4
+
+
+class QuizLastAttempt(Base):
+    __tablename__ = "quiz_last_attempts"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
+    last_attempt_at = Column(DateTime, nullable=False)
+    next_due_at = Column(DateTime, nullable=False)
+    last_reminded_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "quiz_id", name="uq_quiz_last_attempts_user_id_quiz_id"),
+        Index("ix_quiz_last_attempts_shard_next_due_at_id", text(f"(user_id % {REMINDER_SHARDS})"), "next_due_at", "id"),
+    )
+
+
+class ScoreAggregate(Base):
+    __tablename__ = "score_aggregates"
+
+    scope = Column(PgEnum(AggregateScopeEnum, name="aggregate_scope", create_type=True), nullable=False)
+    scope_id = Column(Integer, nullable=False)
+    total_correct_answers = Column(BigInteger, nullable=False, default=0)
+    total_questions_answered = Column(BigInteger, nullable=False, default=0)
+    attempts_count = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (UniqueConstraint("scope", "scope_id", name="uq_score_aggregates_scope_scope_id"),)
+
+
+# Shared by personal and broadcast notifications so the merged inbox is ordered by id alone.
+NOTIFICATIONS_ID_SEQUENCE = "notifications_id_seq"
+
 
 class Notification(Base):
     __tablename__ = 'notifications'
 
+    id = Column(Integer, Sequence(NOTIFICATIONS_ID_SEQUENCE), primary_key=True, index=True,
+                server_default=text(f"nextval('{NOTIFICATIONS_ID_SEQUENCE}')"))
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     status = Column(PgEnum(NotificationStatusEnum, name="notification_status", create_type=True), nullable=False, default=NotificationStatusEnum.UNREAD)
     message = Column(String, nullable=False)
 
     user = relationship("User", back_populates="notifications")
+
+    __table_args__ = (
+        Index("ix_notifications_user_id_id", "user_id", "id"),
+        Index("ix_notifications_user_id_id_unread", "user_id", "id", postgresql_where=text("status = 'UNREAD'")),
+    )
+
+
+class BroadcastNotification(Base):
+    __tablename__ = "broadcast_notifications"
+
+    id = Column(Integer, Sequence(NOTIFICATIONS_ID_SEQUENCE), primary_key=True, index=True,
+                server_default=text(f"nextval('{NOTIFICATIONS_ID_SEQUENCE}')"))
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    role = Column(PgEnum(RoleEnum, name="role", create_type=False), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=func.now())
+    message = Column(String, nullable=False)
+
+    company = relationship("Company")
+
+    __table_args__ = (
+        Index("ix_broadcast_notifications_company_id_id", "company_id", "id"),
+    )
+
+
+class BroadcastReadCursor(Base):
+    __tablename__ = "broadcast_read_cursors"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    last_read_id = Column(Integer, nullable=False, default=0)
+    cleared_up_to_id = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (UniqueConstraint("user_id", "company_id", name="uq_broadcast_read_cursors_user_id_company_id"),)
+
+
+class BroadcastReceipt(Base):
+    """A broadcast the user read or deleted on its own, ahead of their cursors for its company."""
+    __tablename__ = "broadcast_receipts"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    broadcast_id = Column(Integer, ForeignKey("broadcast_notifications.id", ondelete="CASCADE"), nullable=False)
+    is_deleted = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (UniqueConstraint("user_id", "broadcast_id", name="uq_broadcast_receipts_user_id_broadcast_id"),)
+
+
+class OutboxMessage(Base):
+    __tablename__ = "outbox_messages"
+
+    kind = Column(PgEnum(OutboxKindEnum, name="outbox_kind", create_type=True), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (Index("ix_outbox_messages_available_at_id", "available_at", "id"),)
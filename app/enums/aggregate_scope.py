@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class AggregateScopeEnum(Enum):
+    QUIZ = "quiz"
+    USER = "user"
+    COMPANY = "company"
@@ -0,0 +1,5 @@
+from enum import Enum
+
+
+class OutboxKindEnum(Enum):
+    EMAIL_BATCH = "email_batch"
@@ -1,17 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.db.connect_redis import init_redis_pool, close_redis_pool
 from app.routers.company_routers import company_routers
 from app.routers.invite_routers import invite_routers
 from app.routers.quize_score_routers import results_router
 from app.routers.take_save_results import total_results_router
 from app.routers.user_routers import user_router
+from app.services.notification_stream import notification_hub
 from app.core.config import settings
 from app.core.middleware import setup_cors
 import uvicorn
 import logging
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_redis_pool()
+    yield
+    await notification_hub.close()
+    await close_redis_pool()
+
+
+app = FastAPI(lifespan=lifespan)
 setup_cors(app=app)
 
 app.include_router(router=user_router)
@@ -0,0 +1,34 @@
+import json
+
+from aioredis import Redis
+
+
+# Missing counters are rebuilt from Postgres on read, so only cached ones are incremented.
+INCREMENT_IF_CACHED_SCRIPT = """
+local count = tonumber(ARGV[1])
+for i = count + 1, #KEYS do
+    redis.call('INCR', KEYS[i])
+end
+for i = 1, count do
+    if redis.call('EXISTS', KEYS[i]) == 1 then
+        local amount = cjson.decode(ARGV[i + 1])
+        if type(amount) == 'table' then
+            for field, value in pairs(amount) do
+                redis.call('HINCRBY', KEYS[i], field, value)
+            end
+        else
+            redis.call('INCRBY', KEYS[i], amount)
+        end
+    end
+end
+return 1
+"""
+
+
+async def increment_if_cached(redis: Redis, increments: dict[str, int | dict[str, int]],
+                              version_keys: list[str] = ()):
+    """Apply {key: amount} to cached counters and {key: {field: amount}} to cached hashes, and bump version_keys."""
+    if not increments and not version_keys:
+        return
+    await redis.eval(INCREMENT_IF_CACHED_SCRIPT, len(increments) + len(version_keys), *increments, *version_keys,
+                     len(increments), *(json.dumps(amount) for amount in increments.values()))
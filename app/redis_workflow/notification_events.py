@@ -0,0 +1,52 @@
+import json
+import logging
+
+import aioredis
+from aioredis import Redis
+
+from app.db.models import Notification, BroadcastNotification
+from app.enums.notification_status import NotificationStatusEnum
+
+
+logger = logging.getLogger("uvicorn")
+
+
+def get_user_channel(user_id: int) -> str:
+    return f"notifications:user:{user_id}"
+
+
+def get_company_channel(company_id: int) -> str:
+    return f"notifications:company:{company_id}"
+
+
+def build_notification_event(notification: Notification | BroadcastNotification, role: str = None) -> str:
+    return json.dumps({"id": notification.id,
+                       "message": notification.message,
+                       "status": NotificationStatusEnum.UNREAD.value,
+                       "created_at": notification.created_at.isoformat(),
+                       "role": role})
+
+
+async def publish_notification_events(redis: Redis, events: list[tuple[str, str]]):
+    """Publish (channel, event) pairs to every API worker in one round trip; missed events are not retried."""
+    if not events:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for channel, event in events:
+                pipe.publish(channel, event)
+            await pipe.execute()
+    except aioredis.RedisError as error:
+        logger.warning(f"Dropped {len(events)} notification events, cannot publish to Redis: {error}")
+
+
+async def publish_notifications(redis: Redis, notifications: list[Notification]):
+    await publish_notification_events(redis, [(get_user_channel(notification.user_id),
+                                               build_notification_event(notification))
+                                              for notification in notifications])
+
+
+async def publish_broadcast(redis: Redis, broadcast: BroadcastNotification):
+    role = broadcast.role.value if broadcast.role else None
+    await publish_notification_events(redis, [(get_company_channel(broadcast.company_id),
+                                               build_notification_event(broadcast, role=role))])
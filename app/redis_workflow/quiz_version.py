@@ -0,0 +1,14 @@
+from aioredis import Redis
+
+
+def get_quiz_version_key(quiz_id: int) -> str:
+    return f"quiz_version:{quiz_id}"
+
+
+async def get_quiz_version(redis: Redis, quiz_id: int) -> int:
+    version = await redis.get(get_quiz_version_key(quiz_id))
+    return int(version) if version else 0
+
+
+async def bump_quiz_version(redis: Redis, quiz_id: int) -> int:
+    return await redis.incr(get_quiz_version_key(quiz_id))
@@ -0,0 +1,32 @@
+from aioredis import Redis
+
+
+TAKE_TOKEN_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(now - updated_at, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+else
+    wait = (1 - tokens) / rate
+end
+return tostring(wait)
+"""
+
+
+def get_rate_limit_key(name: str) -> str:
+    return f"rate_limit:{name}"
+
+
+async def take_token(redis: Redis, name: str, rate: float, burst: int) -> float:
+    """Take one token from a token bucket shared by all workers; returns the seconds to wait if none is left."""
+    wait = await redis.eval(TAKE_TOKEN_SCRIPT, 1, get_rate_limit_key(name), rate, burst)
+    return float(wait)
@@ -1,21 +1,17 @@
-from app.db.connect_redis import get_redis_connection
+from aioredis import Redis
 
 
-async def save_data_to_redis_db(key, value):
-    redis = await get_redis_connection()
-    await redis.set(key, value)
-    await redis.expire(key, 48 * 3600)
-    redis.close()
+RESULT_TTL = 48 * 3600
 
 
-async def get_data_from_redis_db(key):
-    redis = await get_redis_connection()
+async def save_data_to_redis_db(redis: Redis, key, value):
+    await redis.set(key, value, ex=RESULT_TTL)
+
+
+async def get_data_from_redis_db(redis: Redis, key):
     result = await redis.get(key)
-    redis.close()
     return result
 
 
-async def delete_data_from_redis_db(key):
-    redis = await get_redis_connection()
+async def delete_data_from_redis_db(redis: Redis, key):
     await redis.delete(key)
-    redis.close()
\ No newline at end of file
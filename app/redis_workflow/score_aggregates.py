@@ -0,0 +1,52 @@
+from aioredis import Redis
+
+from app.enums.aggregate_scope import AggregateScopeEnum
+from app.redis_workflow.cached_counters import increment_if_cached
+
+
+AGGREGATE_TTL = 3600
+
+SAVE_IF_UNCHANGED_SCRIPT = """
+if tonumber(redis.call('GET', KEYS[2]) or '0') ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+def get_aggregate_key(scope: AggregateScopeEnum, scope_id: int) -> str:
+    return f"aggregate:{scope.value}:{scope_id}"
+
+
+def get_aggregate_version_key(scope: AggregateScopeEnum, scope_id: int) -> str:
+    return f"aggregate_version:{scope.value}:{scope_id}"
+
+
+async def increment_score_aggregates(redis: Redis, user_id: int, quiz_id: int, company_id: int,
+                                     total_correct_answers: int, total_questions_answered: int):
+    scopes = [(AggregateScopeEnum.QUIZ, quiz_id), (AggregateScopeEnum.USER, user_id),
+              (AggregateScopeEnum.COMPANY, company_id)]
+    increment = {"total_correct_answers": total_correct_answers,
+                 "total_questions_answered": total_questions_answered,
+                 "attempts_count": 1}
+    await increment_if_cached(redis, {get_aggregate_key(scope, scope_id): increment for scope, scope_id in scopes},
+                              version_keys=[get_aggregate_version_key(scope, scope_id) for scope, scope_id in scopes])
+
+
+async def get_score_aggregate(redis: Redis, scope: AggregateScopeEnum, scope_id: int):
+    """Return (cached aggregate or None, version to pass to save_score_aggregate)."""
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hgetall(get_aggregate_key(scope, scope_id))
+        pipe.get(get_aggregate_version_key(scope, scope_id))
+        aggregate, version = await pipe.execute()
+    if not aggregate:
+        return None, int(version or 0)
+    return {field: int(value) for field, value in aggregate.items()}, int(version or 0)
+
+
+async def save_score_aggregate(redis: Redis, scope: AggregateScopeEnum, scope_id: int, aggregate: dict, version: int):
+    fields = [item for field, value in aggregate.items() for item in (field, value)]
+    await redis.eval(SAVE_IF_UNCHANGED_SCRIPT, 2, get_aggregate_key(scope, scope_id),
+                     get_aggregate_version_key(scope, scope_id), version, AGGREGATE_TTL, *fields)
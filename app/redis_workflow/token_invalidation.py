@@ -0,0 +1,15 @@
+from aioredis import Redis
+
+
+def get_user_generation_key(email: str) -> str:
+    # No TTL: an expired key would read as 0 again and match tokens cached before the last bump.
+    return f"auth:user-generation:{email}"
+
+
+async def get_user_generation(redis: Redis, email: str) -> int:
+    generation = await redis.get(get_user_generation_key(email))
+    return int(generation or 0)
+
+
+async def bump_user_generation(redis: Redis, email: str):
+    await redis.incr(get_user_generation_key(email))
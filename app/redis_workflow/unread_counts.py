@@ -0,0 +1,49 @@
+import logging
+
+import aioredis
+from aioredis import Redis
+
+from app.redis_workflow.cached_counters import increment_if_cached
+
+
+UNREAD_COUNT_TTL = 3600
+BROADCAST_UNREAD_COUNT_TTL = 30
+
+logger = logging.getLogger("uvicorn")
+
+
+def get_unread_count_key(user_id: int) -> str:
+    return f"unread:personal:{user_id}"
+
+
+def get_broadcast_unread_count_key(user_id: int) -> str:
+    return f"unread:broadcast:{user_id}"
+
+
+async def adjust_unread_counts(redis: Redis, deltas: dict[int, int]):
+    try:
+        await increment_if_cached(redis, {get_unread_count_key(user_id): delta
+                                          for user_id, delta in deltas.items() if delta})
+    except aioredis.RedisError as error:
+        logger.warning(f"Unread counters left stale until UNREAD_COUNT_TTL, cannot reach Redis: {error}")
+
+
+async def get_unread_counts(redis: Redis, user_id: int):
+    personal, broadcast = await redis.mget(get_unread_count_key(user_id), get_broadcast_unread_count_key(user_id))
+    if personal is None or broadcast is None:
+        return None
+    return max(int(personal), 0), int(broadcast)
+
+
+async def save_unread_counts(redis: Redis, user_id: int, personal: int, broadcast: int):
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.set(get_unread_count_key(user_id), personal, ex=UNREAD_COUNT_TTL)
+        pipe.set(get_broadcast_unread_count_key(user_id), broadcast, ex=BROADCAST_UNREAD_COUNT_TTL)
+        await pipe.execute()
+
+
+async def reset_broadcast_unread_count(redis: Redis, user_id: int):
+    try:
+        await redis.delete(get_broadcast_unread_count_key(user_id))
+    except aioredis.RedisError as error:
+        logger.warning(f"Broadcast unread count left stale until BROADCAST_UNREAD_COUNT_TTL, cannot reach Redis: {error}")
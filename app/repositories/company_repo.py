@@ -13,6 +13,7 @@ from app.services.handlers_errors import get_company_or_404
 from app.utils.helpers import check_company_name_exist
 from app.enums.roles_users import RoleEnum
 from app.enums.visability import VisibilityEnum
+from app.services.token_cache import UserSnapshot
 
 logger = logging.getLogger("uvicorn")
 
@@ -37,7 +38,7 @@ class CompanyRepository:
         return companies_list
 
 
-    async def get_company(self, company_id: int, current_user: User):
+    async def get_company(self, company_id: int, current_user: UserSnapshot):
         company = await get_company_or_404(session=self.session, id=company_id)
 
         company_member = await self.session.execute(
@@ -56,7 +57,7 @@ class CompanyRepository:
 
 
 
-    async def create_company(self, company: CompanyCreateSchema, current_user: User):
+    async def create_company(self, company: CompanyCreateSchema, current_user: UserSnapshot):
         await check_company_name_exist(session=self.session, company_name=company.company_name)
 
         db_company = Company(company_name=company.company_name,
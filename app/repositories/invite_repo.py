@@ -1,11 +1,12 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import User, InviteUser
+from app.db.models import InviteUser
 from app.schemas.invites import InviteCreateSchema
 from app.services.handlers_errors import get_company_or_404
 from app.enums.invite_status import InviteStatusEnum, InviteTypeEnum
 from app.services.invites_services import InvitesServices
+from app.services.token_cache import UserSnapshot
 
 
 class InviteRepository:
@@ -14,7 +15,7 @@ class InviteRepository:
         self.session = session
 
 
-    async def create_invite(self, invite:InviteCreateSchema, current_user: User):
+    async def create_invite(self, invite:InviteCreateSchema, current_user: UserSnapshot):
         company = await get_company_or_404(session=self.session, company_name=invite.company_name)
         if not company:
             raise HTTPException(status_code=404, detail="Company not found")
@@ -26,13 +27,13 @@ class InviteRepository:
         return results
 
 
-    async def get_user_incoming_invites(self, current_user: User):
+    async def get_user_incoming_invites(self, current_user: UserSnapshot):
         results = await InvitesServices.get_all_incoming_invites_service(session=self.session,
                                                                          current_user=current_user)
         return results
 
 
-    async def accept_invite(self, invite_id: int, current_user: User):
+    async def accept_invite(self, invite_id: int, current_user: UserSnapshot):
         invite = await self.session.get(InviteUser, invite_id)
         if invite:
             await InvitesServices.accept_invite_service(session=self.session,
@@ -42,7 +43,7 @@ class InviteRepository:
             raise HTTPException(status_code=404, detail="Invite not found")
 
 
-    async def reject_invite(self, invite_id: int, current_user: User):
+    async def reject_invite(self, invite_id: int, current_user: UserSnapshot):
         invite = await self.session.get(InviteUser, invite_id)
         if not invite:
             raise HTTPException(status_code=404, detail="Invite not found")
@@ -56,7 +57,7 @@ class InviteRepository:
                                 detail="Permission denied: You can only reject invites that were sent to you")
 
 
-    async def delete_invite_or_request(self, invite_id: int, current_user: User):
+    async def delete_invite_or_request(self, invite_id: int, current_user: UserSnapshot):
         invite = await self.session.get(InviteUser, invite_id)
         if invite:
             await InvitesServices.delete_invite_or_request_service(session=self.session,
@@ -1,9 +1,17 @@
+from aioredis import Redis
 from fastapi import HTTPException
-from sqlalchemy import and_, select
+from sqlalchemy import and_, or_, select, update, delete, case, literal, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Notification
+from app.db.models import Notification, BroadcastNotification, BroadcastReadCursor, BroadcastReceipt, CompanyMember
 from app.enums.notification_status import NotificationStatusEnum
+from app.enums.roles_users import RoleEnum
+from app.redis_workflow.notification_events import publish_notifications
+from app.repositories.outbox_repo import OutboxRepository
+from app.redis_workflow.unread_counts import adjust_unread_counts, get_unread_counts, save_unread_counts, \
+    reset_broadcast_unread_count
+from app.schemas.notifications import NotificationReadSchema, UnreadCountSchema, NotificationSelectionSchema
 
 
 class NotificationRepository:
@@ -12,21 +20,260 @@ class NotificationRepository:
         self.session = session
 
 
-    async def save_message_to_db(self, user_id: int, message: str):
+    async def save_message_to_db(self, user_id: int, message: str, redis: Redis, email_to: dict = None):
         notification = Notification(user_id=user_id, message=message)
         self.session.add(notification)
+        if email_to:
+            OutboxRepository(session=self.session).add_email_batch([{**email_to, "message_text": message}])
         await self.session.commit()
+        await adjust_unread_counts(redis, {user_id: 1})
+        await publish_notifications(redis, [notification])
 
 
-    async def mark_message_as_read(self, message_id: int, user_id: int):
-        query = await self.session.execute(select(Notification)
-                                            .where(and_(Notification.id == message_id, Notification.user_id == user_id)))
-        notification = query.scalar_one_or_none()
+    async def save_broadcast_to_db(self, company_id: int, message: str, role: RoleEnum = None):
+        broadcast = BroadcastNotification(company_id=company_id, role=role, message=message)
+        self.session.add(broadcast)
+        recipients = select(func.count()).select_from(CompanyMember).where(CompanyMember.company_id == company_id)
+        if role is not None:
+            recipients = recipients.where(CompanyMember.role == role)
+        result = await self.session.execute(recipients)
+        return broadcast, result.scalar_one()
 
-        if notification:
-            notification.status = NotificationStatusEnum.READ
-            await self.session.commit()
-            await self.session.refresh(notification)
-            return notification
-        else:
-            raise HTTPException(status_code=404, detail="Message not found")
\ No newline at end of file
+
+    async def get_company_roles(self, user_id: int) -> dict[int, str]:
+        result = await self.session.execute(
+            select(CompanyMember.company_id, CompanyMember.role).where(CompanyMember.user_id == user_id)
+        )
+        return {company_id: role.value for company_id, role in result.all()}
+
+
+    @staticmethod
+    def visible_broadcasts(user_id: int):
+        return and_(CompanyMember.company_id == BroadcastNotification.company_id,
+                    CompanyMember.user_id == user_id,
+                    or_(BroadcastNotification.role.is_(None), BroadcastNotification.role == CompanyMember.role),
+                    or_(CompanyMember.created_at.is_(None), CompanyMember.created_at <= BroadcastNotification.created_at))
+
+
+    @staticmethod
+    def broadcast_is_read():
+        return or_(BroadcastNotification.id <= func.coalesce(BroadcastReadCursor.last_read_id, 0),
+                   BroadcastReceipt.id.is_not(None))
+
+
+    def build_broadcasts_query(self, user_id: int, *columns):
+        return (
+            select(*columns)
+            .join(CompanyMember, self.visible_broadcasts(user_id))
+            .outerjoin(BroadcastReadCursor, and_(BroadcastReadCursor.user_id == user_id,
+                                                 BroadcastReadCursor.company_id == BroadcastNotification.company_id))
+            .outerjoin(BroadcastReceipt, and_(BroadcastReceipt.user_id == user_id,
+                                              BroadcastReceipt.broadcast_id == BroadcastNotification.id))
+            .where(BroadcastNotification.id > func.coalesce(BroadcastReadCursor.cleared_up_to_id, 0),
+                   BroadcastReceipt.is_deleted.is_not(True))
+        )
+
+
+    def build_inbox_query(self, user_id: int, before_id: int = None, status: NotificationStatusEnum = None,
+                          limit: int = 10):
+        status_type = Notification.status.type
+        personal = (
+            select(Notification.id, Notification.message, Notification.status,
+                   Notification.created_at, Notification.updated_at)
+            .where(Notification.user_id == user_id)
+        )
+        broadcast = self.build_broadcasts_query(
+            user_id,
+            BroadcastNotification.id,
+            BroadcastNotification.message,
+            case((self.broadcast_is_read(), literal(NotificationStatusEnum.READ, type_=status_type)),
+                 else_=literal(NotificationStatusEnum.UNREAD, type_=status_type)).label("status"),
+            BroadcastNotification.created_at,
+            BroadcastNotification.updated_at
+        )
+
+        if before_id is not None:
+            personal = personal.where(Notification.id < before_id)
+            broadcast = broadcast.where(BroadcastNotification.id < before_id)
+        if status is not None:
+            personal = personal.where(Notification.status == status)
+            is_read = self.broadcast_is_read()
+            broadcast = broadcast.where(is_read if status == NotificationStatusEnum.READ else ~is_read)
+
+        personal = personal.order_by(Notification.id.desc()).limit(limit)
+        broadcast = broadcast.order_by(BroadcastNotification.id.desc()).limit(limit)
+        return personal.union_all(broadcast).subquery("inbox")
+
+
+    async def get_inbox(self, user_id: int, before_id: int = None, status: NotificationStatusEnum = None,
+                        limit: int = 10):
+        inbox = self.build_inbox_query(user_id=user_id, before_id=before_id, status=status, limit=limit)
+        result = await self.session.execute(select(inbox).order_by(inbox.c.id.desc()).limit(limit))
+        return result.all()
+
+
+    async def count_unread(self, user_id: int):
+        personal = (
+            select(func.count())
+            .select_from(Notification)
+            .where(and_(Notification.user_id == user_id, Notification.status == NotificationStatusEnum.UNREAD))
+            .scalar_subquery()
+        )
+        broadcast = (
+            self.build_broadcasts_query(user_id, func.count())
+            .select_from(BroadcastNotification)
+            .where(~self.broadcast_is_read())
+            .scalar_subquery()
+        )
+        result = await self.session.execute(select(personal, broadcast))
+        return tuple(result.one())
+
+
+    async def get_unread_count(self, user_id: int, redis: Redis):
+        counts = await get_unread_counts(redis, user_id=user_id)
+        if counts is None:
+            counts = await self.count_unread(user_id=user_id)
+            await save_unread_counts(redis, user_id, *counts)
+        personal, broadcast = counts
+        return UnreadCountSchema(unread_count=personal + broadcast)
+
+
+    async def mark_message_as_read(self, message_id: int, user_id: int, redis: Redis):
+        query = await self.session.execute(
+            update(Notification)
+            .where(and_(Notification.id == message_id,
+                        Notification.user_id == user_id,
+                        Notification.status == NotificationStatusEnum.UNREAD))
+            .values(status=NotificationStatusEnum.READ, updated_at=func.now())
+            .returning(Notification.id, Notification.message, Notification.status, Notification.updated_at)
+        )
+        notification = query.one_or_none()
+        unread_delta = -1 if notification else 0
+
+        if not notification:
+            query = await self.session.execute(
+                select(Notification.id, Notification.message, Notification.status, Notification.updated_at)
+                .where(and_(Notification.id == message_id, Notification.user_id == user_id))
+            )
+            notification = query.one_or_none()
+
+        broadcast = None
+        if not notification:
+            query = await self.session.execute(
+                select(BroadcastNotification.id, BroadcastNotification.message)
+                .join(CompanyMember, self.visible_broadcasts(user_id))
+                .where(BroadcastNotification.id == message_id)
+            )
+            broadcast = query.one_or_none()
+            if not broadcast:
+                raise HTTPException(status_code=404, detail="Message not found")
+            read_at = await self.save_receipt(user_id=user_id, broadcast_id=broadcast.id)
+            notification = (broadcast.id, broadcast.message, NotificationStatusEnum.READ, read_at)
+
+        await self.session.commit()
+        await adjust_unread_counts(redis, {user_id: unread_delta})
+        if broadcast:
+            await reset_broadcast_unread_count(redis, user_id=user_id)
+        message_id, message, status, updated_at = notification
+        return NotificationReadSchema(id=message_id, message=message, status=status.value, updated_at=updated_at)
+
+
+    async def save_receipt(self, user_id: int, broadcast_id: int):
+        query = insert(BroadcastReceipt).values(user_id=user_id, broadcast_id=broadcast_id)
+        query = query.on_conflict_do_update(
+            constraint="uq_broadcast_receipts_user_id_broadcast_id",
+            set_={"updated_at": BroadcastReceipt.updated_at}
+        ).returning(BroadcastReceipt.updated_at)
+        result = await self.session.execute(query)
+        return result.scalar_one()
+
+
+    @staticmethod
+    def selection_filter(column, selection: NotificationSelectionSchema):
+        if selection.ids is not None:
+            return column.in_(selection.ids)
+        return column <= selection.up_to_id
+
+
+    async def advance_read_cursors(self, user_id: int, up_to_id: int, clear: bool = False):
+        newest = func.max(BroadcastNotification.id)
+        selected = (
+            select(literal(user_id), BroadcastNotification.company_id, newest,
+                   newest if clear else literal(0))
+            .join(CompanyMember, self.visible_broadcasts(user_id))
+            .where(BroadcastNotification.id <= up_to_id)
+            .group_by(BroadcastNotification.company_id)
+        )
+        query = insert(BroadcastReadCursor).from_select(
+            ["user_id", "company_id", "last_read_id", "cleared_up_to_id"], selected
+        )
+        query = query.on_conflict_do_update(
+            constraint="uq_broadcast_read_cursors_user_id_company_id",
+            set_={"last_read_id": func.greatest(BroadcastReadCursor.last_read_id, query.excluded.last_read_id),
+                  "cleared_up_to_id": func.greatest(BroadcastReadCursor.cleared_up_to_id,
+                                                    query.excluded.cleared_up_to_id),
+                  "updated_at": func.now()}
+        ).returning(BroadcastReadCursor.company_id)
+        result = await self.session.execute(query)
+        companies = result.scalars().all()
+
+        redundant = delete(BroadcastReceipt).where(and_(BroadcastReceipt.user_id == user_id,
+                                                        BroadcastReceipt.broadcast_id <= up_to_id))
+        if not clear:
+            redundant = redundant.where(BroadcastReceipt.is_deleted.is_(False))
+        await self.session.execute(redundant)
+        return companies
+
+
+    async def save_receipts(self, user_id: int, broadcast_ids: list[int], deleted: bool = False):
+        selected = (
+            select(literal(user_id), BroadcastNotification.id, literal(deleted))
+            .join(CompanyMember, self.visible_broadcasts(user_id))
+            .where(BroadcastNotification.id.in_(broadcast_ids))
+        )
+        query = insert(BroadcastReceipt).from_select(["user_id", "broadcast_id", "is_deleted"], selected)
+        query = query.on_conflict_do_update(
+            constraint="uq_broadcast_receipts_user_id_broadcast_id",
+            set_={"is_deleted": BroadcastReceipt.is_deleted | query.excluded.is_deleted, "updated_at": func.now()}
+        ).returning(BroadcastReceipt.broadcast_id)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+
+    async def mark_broadcasts(self, user_id: int, selection: NotificationSelectionSchema, clear: bool = False):
+        if selection.ids is not None:
+            return await self.save_receipts(user_id=user_id, broadcast_ids=selection.ids, deleted=clear)
+        return await self.advance_read_cursors(user_id=user_id, up_to_id=selection.up_to_id, clear=clear)
+
+
+    async def mark_messages_as_read(self, user_id: int, selection: NotificationSelectionSchema, redis: Redis):
+        query = await self.session.execute(
+            update(Notification)
+            .where(and_(Notification.user_id == user_id,
+                        Notification.status == NotificationStatusEnum.UNREAD,
+                        self.selection_filter(Notification.id, selection)))
+            .values(status=NotificationStatusEnum.READ, updated_at=func.now())
+            .returning(Notification.id)
+        )
+        read_ids = query.scalars().all()
+        broadcasts = await self.mark_broadcasts(user_id=user_id, selection=selection)
+        await self.session.commit()
+
+        await adjust_unread_counts(redis, {user_id: -len(read_ids)})
+        if broadcasts:
+            await reset_broadcast_unread_count(redis, user_id=user_id)
+
+
+    async def delete_messages(self, user_id: int, selection: NotificationSelectionSchema, redis: Redis):
+        query = await self.session.execute(
+            delete(Notification)
+            .where(and_(Notification.user_id == user_id, self.selection_filter(Notification.id, selection)))
+            .returning(Notification.status)
+        )
+        deleted_unread = sum(status == NotificationStatusEnum.UNREAD for status in query.scalars())
+        broadcasts = await self.mark_broadcasts(user_id=user_id, selection=selection, clear=True)
+        await self.session.commit()
+
+        await adjust_unread_counts(redis, {user_id: -deleted_unread})
+        if broadcasts:
+            await reset_broadcast_unread_count(redis, user_id=user_id)
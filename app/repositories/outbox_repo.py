@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import OutboxMessage
+from app.enums.outbox_kind import OutboxKindEnum
+
+
+class OutboxRepository:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+
+    def add_email_batch(self, recipients: list[dict]):
+        self.session.add(OutboxMessage(kind=OutboxKindEnum.EMAIL_BATCH, payload={"recipients": recipients}))
+
+
+    async def claim_messages(self, limit: int = 100):
+        """Delete and return the oldest messages no other relay holds; a rollback puts them back."""
+        available = (
+            select(OutboxMessage.id)
+            .where(OutboxMessage.available_at <= datetime.utcnow())
+            .order_by(OutboxMessage.available_at, OutboxMessage.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            delete(OutboxMessage)
+            .where(OutboxMessage.id.in_(available))
+            .returning(OutboxMessage.id, OutboxMessage.kind, OutboxMessage.payload)
+        )
+        return result.all()
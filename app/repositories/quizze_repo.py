@@ -1,15 +1,19 @@
 from typing import List
 
+from aioredis import Redis
 from fastapi import HTTPException
 from pydantic import ValidationError
+from sqlalchemy import insert, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from starlette import status
 
-from app.db.models import Quiz, Question, Option
-from app.schemas.quizzes import QuizUpdateSchema, QuizCreateSchema, QuizBaseSchema, QuestionBaseSchema, \
+from app.db.models import Quiz, Question, Option, QuizLastAttempt
+from app.redis_workflow.notification_events import publish_broadcast
+from app.schemas.quizzes import QuizUpdateSchema, QuizCreateSchema, QuizCreatedSchema, QuestionBaseSchema, \
     OptionBaseSchema, QuestionUpdateSchema
+from app.services.answer_key_cache import invalidate_answer_key
 from app.services.handlers_errors import validate_quiz_data
 from app.utils.checking_uniqueness_quiz import checking_the_quiz_uniqueness
 from app.utils.send_notification_after_create_quiz import send_notifications
@@ -21,7 +25,7 @@ class QuizRepository:
         self.session = session
 
 
-    async def create_quiz(self, company_id: int, quiz_data: QuizCreateSchema):
+    async def create_quiz(self, company_id: int, quiz_data: QuizCreateSchema, redis: Redis):
         await validate_quiz_data(quiz_data)
         await checking_the_quiz_uniqueness(session=self.session, company_id=company_id, quiz_title=quiz_data.title)
         title = quiz_data.title
@@ -30,40 +34,39 @@ class QuizRepository:
         new_quiz = Quiz(title=title, description= description, frequency_days=frequency_days, company_id=company_id)
         self.session.add(new_quiz)
         await self.session.flush()
-        questions = []
-        options = []
-
-        for question_data in quiz_data.questions:
-            text = question_data.text
-            question = Question(text=text, quiz_id=new_quiz.id)
-            self.session.add(question)
-            await self.session.flush()
-            questions.append(question)
-
-            for option_data in question_data.options:
-                text = option_data.text
-                is_correct = option_data.is_correct
-                option = Option(text=text, is_correct=is_correct, question_id=question.id)
-                options.append(option)
-                self.session.add(option)
 
+        if quiz_data.questions:
+            question_ids = await self.session.execute(
+                insert(Question).returning(Question.id, sort_by_parameter_order=True),
+                [{"text": question_data.text, "quiz_id": new_quiz.id} for question_data in quiz_data.questions]
+            )
+            options = [
+                {"text": option_data.text, "is_correct": option_data.is_correct, "question_id": question_id}
+                for question_id, question_data in zip(question_ids.scalars().all(), quiz_data.questions)
+                for option_data in question_data.options
+            ]
+            if options:
+                await self.session.execute(insert(Option), options)
+
+        broadcast, notified_members = await send_notifications(session=self.session, quiz=new_quiz)
         await self.session.commit()
+        await publish_broadcast(redis, broadcast)
         questions_data = [
             QuestionBaseSchema(
-                text=question.text,
+                text=question_data.text,
                 options=[
                     OptionBaseSchema(
-                        text=option.text,
-                        is_correct=option.is_correct
-                    ) for option in options
+                        text=option_data.text,
+                        is_correct=option_data.is_correct
+                    ) for option_data in question_data.options
                 ]
-            ) for question in questions
+            ) for question_data in quiz_data.questions
         ]
-        await send_notifications(session=self.session, quiz=new_quiz)
-        answer = QuizBaseSchema(title=new_quiz.title,
-                                description=new_quiz.description,
-                                frequency_days=new_quiz.frequency_days,
-                                questions=questions_data)
+        answer = QuizCreatedSchema(title=new_quiz.title,
+                                   description=new_quiz.description,
+                                   frequency_days=new_quiz.frequency_days,
+                                   questions=questions_data,
+                                   notified_members=notified_members)
         return answer
 
 
@@ -80,7 +83,7 @@ class QuizRepository:
         return quizzes
 
 
-    async def update_quiz(self, quiz_id: int, quiz_data: QuizUpdateSchema):
+    async def update_quiz(self, quiz_id: int, quiz_data: QuizUpdateSchema, redis: Redis):
         quiz = (
             select(Quiz)
             .options(selectinload(Quiz.questions))
@@ -92,15 +95,28 @@ class QuizRepository:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
         try:
             quiz_data_dict = quiz_data.dict(exclude_unset=True)
+            frequency_changed = quiz_data_dict.get("frequency_days", quiz.frequency_days) != quiz.frequency_days
             for field, value in quiz_data_dict.items():
                 setattr(quiz, field, value)
+            if frequency_changed:
+                await self.reschedule_attempts(quiz_id=quiz_id, frequency_days=quiz.frequency_days)
             await self.session.commit()
+            await invalidate_answer_key(redis, quiz_id)
             return quiz
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=f"Validation quiz error: {e}")
 
 
-    async def update_questions(self, quiz_id: int, question_data_list: List[QuestionUpdateSchema]):
+    async def reschedule_attempts(self, quiz_id: int, frequency_days: int):
+        await self.session.execute(
+            update(QuizLastAttempt)
+            .where(QuizLastAttempt.quiz_id == quiz_id)
+            .values(next_due_at=QuizLastAttempt.last_attempt_at + func.make_interval(0, 0, 0, frequency_days),
+                    updated_at=func.now())
+        )
+
+
+    async def update_questions(self, quiz_id: int, question_data_list: List[QuestionUpdateSchema], redis: Redis):
         quiz = (
             select(Quiz)
             .options(selectinload(Quiz.questions).selectinload(Question.options))
@@ -148,14 +164,16 @@ class QuizRepository:
                         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                             detail=f"Question with ID {question_data.id} not found")
             await self.session.commit()
+            await invalidate_answer_key(redis, quiz_id)
             return quiz
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=f"Validation error: {e}")
 
 
-    async def delete_quiz(self, quiz_id: int):
+    async def delete_quiz(self, quiz_id: int, redis: Redis):
         quiz = await self.session.get(Quiz, quiz_id)
         if not quiz:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
         await self.session.delete(quiz)
         await self.session.commit()
+        await invalidate_answer_key(redis, quiz_id)
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from sqlalchemy import select, insert, update, or_, tuple_, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import QuizLastAttempt, Quiz, User, Notification, REMINDER_SHARDS
+
+
+class ReminderRepository:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+
+    async def claim_overdue_quizzes(self, now: datetime, reminded_before: datetime, shard: int,
+                                    after: tuple[datetime, int] = (datetime.min, 0), limit: int = 1000):
+        """Stamp and return one (next_due_at, id) page of the shard's due pairs; does not commit."""
+        # A literal modulus, so the expression matches the one the index is built on.
+        user_shard = QuizLastAttempt.user_id % literal_column(str(REMINDER_SHARDS))
+        due = (
+            select(QuizLastAttempt.id)
+            .where(QuizLastAttempt.next_due_at <= now,
+                   or_(QuizLastAttempt.last_reminded_at.is_(None), QuizLastAttempt.last_reminded_at <= reminded_before),
+                   user_shard == shard,
+                   tuple_(QuizLastAttempt.next_due_at, QuizLastAttempt.id) > tuple_(*after))
+            .order_by(QuizLastAttempt.next_due_at, QuizLastAttempt.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = (
+            update(QuizLastAttempt)
+            .where(QuizLastAttempt.id.in_(due))
+            .values(last_reminded_at=now)
+            .returning(QuizLastAttempt.id, QuizLastAttempt.next_due_at, QuizLastAttempt.user_id, QuizLastAttempt.quiz_id)
+            .cte("claimed")
+        )
+        query = (
+            select(claimed.c.id, claimed.c.next_due_at, claimed.c.user_id, claimed.c.quiz_id,
+                   Quiz.title, User.email, User.username)
+            .join(Quiz, Quiz.id == claimed.c.quiz_id)
+            .join(User, User.id == claimed.c.user_id)
+            .order_by(claimed.c.next_due_at, claimed.c.id)
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+
+    async def save_reminders(self, overdue_quizzes) -> list:
+        result = await self.session.execute(
+            insert(Notification).returning(Notification.id, Notification.user_id, Notification.message,
+                                           Notification.created_at),
+            [{"user_id": overdue.user_id, "message": f"It's time to take the quiz '{overdue.title}'!"}
+             for overdue in overdue_quizzes]
+        )
+        return result.all()
@@ -1,10 +1,11 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import User, InviteUser
+from app.db.models import InviteUser
 from app.schemas.invites import InviteCreateSchema
 from app.services.handlers_errors import get_company_or_404
 from app.services.requests_services import RequestService
+from app.services.token_cache import UserSnapshot
 
 
 class RequestsRepository:
@@ -13,11 +14,11 @@ class RequestsRepository:
         self.session = session
 
 
-    async def get_all_user_requests(self, current_user: User):
+    async def get_all_user_requests(self, current_user: UserSnapshot):
         await RequestService.get_all_user_requests_service(session=self.session, current_user=current_user)
 
 
-    async def get_requests_users_in_company(self, company_id: int, current_user: User):
+    async def get_requests_users_in_company(self, company_id: int, current_user: UserSnapshot):
         company = await get_company_or_404(session=self.session, id=company_id)
         if not company:
             raise HTTPException(status_code=404, detail="Company not found")
@@ -29,21 +30,21 @@ class RequestsRepository:
             return users
 
 
-    async def create_request(self, invite: InviteCreateSchema, current_user: User):
+    async def create_request(self, invite: InviteCreateSchema, current_user: UserSnapshot):
         request_create = await RequestService.create_request_service(session=self.session,
                                                                      invite=invite,
                                                                      current_user=current_user)
         return request_create
 
 
-    async def accept_request(self, invite_id: int, current_user: User):
+    async def accept_request(self, invite_id: int, current_user: UserSnapshot):
         await RequestService.accept_request_service(session=self.session,
                                                     invite_id=invite_id,
                                                     current_user=current_user)
 
 
 
-    async def reject_request(self, invite_id: int, current_user: User):
+    async def reject_request(self, invite_id: int, current_user: UserSnapshot):
         invite = await self.session.get(InviteUser, invite_id)
         if not invite:
             raise HTTPException(status_code=404, detail="Request not found")
@@ -54,7 +55,7 @@ class RequestsRepository:
 
 
 
-    async def delete_request(self, invite_id: int, current_user: User):
+    async def delete_request(self, invite_id: int, current_user: UserSnapshot):
         invite = await self.session.get(InviteUser, invite_id)
         if invite.user_id == current_user.id:
             await self.session.delete(invite)
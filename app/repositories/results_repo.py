@@ -1,19 +1,21 @@
-import json
+from datetime import datetime, timedelta
 
+from aioredis import Redis
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import select, func, literal
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from starlette import status
 
-from app.db.models import Quiz, QuizResult, Option
-from app.redis_workflow.get_results_from_keys import get_data_by_quiz_id, get_data_by_company_id, get_data_by_user_id
-from app.redis_workflow.redis_workers import save_data_to_redis_db
-from app.redis_workflow.save_results_to_redis import save_results_to_redis
-from app.schemas.result_quizes import QuizResultSchema, QuizAttemptSchema
-from app.services.calculate_average_results import calculate_average_score_db, calculate_average_score_redis
-from app.services.results_for_quiz import calculate_quiz_score
-from app.utils.check_time_solve_quiz import check_timeout
+from app.db.models import Quiz, QuizResult, QuizLastAttempt
+from app.enums.aggregate_scope import AggregateScopeEnum
+from app.redis_workflow.score_aggregates import get_score_aggregate, save_score_aggregate, increment_score_aggregates
+from app.repositories.score_aggregate_repo import ScoreAggregateRepository
+from app.schemas.result_quizes import QuizResultSchema, QuizAttemptSchema, DueQuizSchema
+from app.services.calculate_average_results import calculate_average_score_redis
+from app.services.answer_key_cache import get_answer_key
+from app.services.results_for_quiz import grade_quiz_attempt, AnswerKey, QuizGrade
 
 
 class ResultsRepository:
@@ -35,114 +37,130 @@ class ResultsRepository:
         return quiz
 
 
-    async def calculate_and_save_quiz_result(self, user_id: int, quiz_attempt: QuizAttemptSchema, company_id: int):
-        quiz = await self.get_quiz_for_solve_repo(quiz_id=quiz_attempt.quiz_id)
-        await check_timeout(self.session, quiz, user_id)
-        score = calculate_quiz_score(quiz, quiz_attempt.answers)
-
-        total_correct_answers = 0
-        total_questions_answered = len(quiz.questions)
-
-        for answer in quiz_attempt.answers:
-            options = await self.session.execute(select(Option).filter(Option.question_id == answer.question_id))
-            options = options.scalars().all()
-
-            for option in options:
-                if option.id == answer.option_id and option.is_correct:
-                    total_correct_answers += 1
-                    break
-
-        quiz_result_data = {
-            "user_id": user_id,
-            "quiz_id": quiz_attempt.quiz_id,
-            "company_id": company_id,
-            "score": score,
-            "total_correct_answers": total_correct_answers,
-            "total_questions_answered": total_questions_answered,
-        }
-
-        await save_data_to_redis_db(f"{user_id}:{quiz_attempt.quiz_id}:{company_id}",
-                                    json.dumps(quiz_result_data))
-
-        quiz_result = QuizResult(user_id=user_id,
-                                 quiz_id=quiz_attempt.quiz_id,
-                                 company_id=company_id,
-                                 score=score,
-                                 total_correct_answers=total_correct_answers,
-                                 total_questions_answered=total_questions_answered)
-        self.session.add(quiz_result)
+    async def insert_attempt_result(self, user_id: int, company_id: int, answer_key: AnswerKey, grade: QuizGrade):
+        """Record an attempt in one statement, or return None while the retake window is closed."""
+        solved_at = datetime.utcnow()
+
+        attempt = insert(QuizLastAttempt).values(user_id=user_id,
+                                                 quiz_id=answer_key.quiz_id,
+                                                 last_attempt_at=solved_at,
+                                                 next_due_at=solved_at + timedelta(days=answer_key.frequency_days))
+        attempt = attempt.on_conflict_do_update(
+            constraint="uq_quiz_last_attempts_user_id_quiz_id",
+            set_={"last_attempt_at": attempt.excluded.last_attempt_at,
+                  "next_due_at": attempt.excluded.next_due_at,
+                  "last_reminded_at": None,
+                  "updated_at": func.now()},
+            where=QuizLastAttempt.next_due_at <= attempt.excluded.last_attempt_at
+        ).returning(QuizLastAttempt.user_id).cte("attempt")
+
+        inserted_result = insert(QuizResult).from_select(
+            ["user_id", "quiz_id", "company_id", "score", "total_correct_answers", "total_questions_answered", "solved_at"],
+            select(attempt.c.user_id,
+                   literal(answer_key.quiz_id),
+                   literal(company_id),
+                   literal(grade.score),
+                   literal(grade.total_correct_answers),
+                   literal(grade.total_questions_answered),
+                   literal(solved_at))
+        ).returning(QuizResult.id).cte("inserted_result")
+
+        aggregates = ScoreAggregateRepository.build_add_result_query(
+            user_id=user_id,
+            quiz_id=answer_key.quiz_id,
+            company_id=company_id,
+            total_correct_answers=grade.total_correct_answers,
+            total_questions_answered=grade.total_questions_answered,
+            inserted_result=inserted_result
+        ).cte("aggregates")
+
+        result = await self.session.execute(select(inserted_result.c.id).add_cte(aggregates))
+        return result.scalar_one_or_none()
+
+
+    async def get_due_quizzes(self, user_id: int, skip: int = 0, limit: int = 10):
+        query = (
+            select(QuizLastAttempt.quiz_id, Quiz.title, Quiz.company_id,
+                   QuizLastAttempt.last_attempt_at, QuizLastAttempt.next_due_at)
+            .join(Quiz, Quiz.id == QuizLastAttempt.quiz_id)
+            .where(QuizLastAttempt.user_id == user_id, QuizLastAttempt.next_due_at <= datetime.utcnow())
+            .order_by(QuizLastAttempt.next_due_at)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [DueQuizSchema.model_validate(row) for row in result.all()]
+
+
+    async def calculate_and_save_quiz_result(self, user_id: int, quiz_attempt: QuizAttemptSchema, company_id: int,
+                                             redis: Redis):
+        answer_key = await get_answer_key(self.session, redis, quiz_id=quiz_attempt.quiz_id)
+        grade = grade_quiz_attempt(answer_key, quiz_attempt.answers)
+
+        quiz_result_id = await self.insert_attempt_result(user_id=user_id,
+                                                          company_id=company_id,
+                                                          answer_key=answer_key,
+                                                          grade=grade)
+        if quiz_result_id is None:
+            await self.session.rollback()
+            raise HTTPException(status_code=403, detail="Not enough time has passed since the last attempt")
         await self.session.commit()
 
-        return QuizResultSchema(user_id=quiz_result.user_id,
-                                quiz_id=quiz_result.quiz_id,
-                                company_id=quiz_result.company_id,
-                                score=quiz_result.score)
+        await increment_score_aggregates(redis,
+                                         user_id=user_id,
+                                         quiz_id=quiz_attempt.quiz_id,
+                                         company_id=company_id,
+                                         total_correct_answers=grade.total_correct_answers,
+                                         total_questions_answered=grade.total_questions_answered)
 
+        return QuizResultSchema(user_id=user_id,
+                                quiz_id=quiz_attempt.quiz_id,
+                                company_id=company_id,
+                                score=grade.score)
 
-    async def get_quiz_average_score(self, quiz_id: int):
-        quiz_results = await get_data_by_quiz_id(quiz_id)
 
-        if quiz_results:
-            answer_dict = {"total_questions_answered": 0, "total_correct_answers": 0}
-            for result in quiz_results:
-                response_dict = json.loads(result)
-                answer_dict["total_questions_answered"] += response_dict["total_questions_answered"]
-                answer_dict["total_correct_answers"] += response_dict["total_correct_answers"]
-            return await calculate_average_score_redis(answer_dict)
+    async def get_average_score(self, scope: AggregateScopeEnum, scope_id: int, redis: Redis):
+        aggregate, version = await get_score_aggregate(redis, scope, scope_id)
+        if not aggregate:
+            aggregate = await ScoreAggregateRepository(self.session).get_aggregate(scope, scope_id)
+            if aggregate:
+                await save_score_aggregate(redis, scope, scope_id, aggregate, version)
 
-        quiz_results = (select(QuizResult).where(QuizResult.quiz_id == quiz_id))
+        if aggregate:
+            return await calculate_average_score_redis(aggregate)
 
-        quiz_results = await self.session.execute(quiz_results)
-        quiz_results = quiz_results.scalars().all()
+        return await self.get_average_score_from_results(scope, scope_id, redis, version)
 
-        if quiz_results:
-            await save_results_to_redis(quiz_results)
-            return await calculate_average_score_db(quiz_results)
-        else:
-            raise HTTPException(status_code=404, detail="No quiz results found")
 
+    async def get_average_score_from_results(self, scope: AggregateScopeEnum, scope_id: int, redis: Redis, version: int):
+        result_columns = {
+            AggregateScopeEnum.QUIZ: QuizResult.quiz_id,
+            AggregateScopeEnum.USER: QuizResult.user_id,
+            AggregateScopeEnum.COMPANY: QuizResult.company_id,
+        }
+        query = (
+            select(func.coalesce(func.sum(QuizResult.total_correct_answers), 0).label("total_correct_answers"),
+                   func.coalesce(func.sum(QuizResult.total_questions_answered), 0).label("total_questions_answered"),
+                   func.count(QuizResult.id).label("attempts_count"))
+            .where(result_columns[scope] == scope_id)
+        )
+        result = await self.session.execute(query)
+        aggregate = dict(result.one()._mapping)
 
-    async def get_user_average_score(self, user_id: int):
-        user_results = await get_data_by_user_id(user_id)
-
-        if user_results:
-            answer_dict = {"total_questions_answered": 0, "total_correct_answers": 0}
-            for result in user_results:
-                response_dict = json.loads(result)
-                answer_dict["total_questions_answered"] += response_dict["total_questions_answered"]
-                answer_dict["total_correct_answers"] += response_dict["total_correct_answers"]
-            return await calculate_average_score_redis(answer_dict)
-
-        quiz_results = (select(QuizResult).where(QuizResult.user_id == user_id))
-
-        quiz_results = await self.session.execute(quiz_results)
-        quiz_results = quiz_results.scalars().all()
-
-        if quiz_results:
-            await save_results_to_redis(quiz_results)
-            return await calculate_average_score_db(quiz_results)
-        else:
+        if not aggregate["attempts_count"]:
             raise HTTPException(status_code=404, detail="No quiz results found")
 
+        await save_score_aggregate(redis, scope, scope_id, aggregate, version)
+        return await calculate_average_score_redis(aggregate)
 
-    async def get_company_average_score(self, company_id: int):
-        company_results = await get_data_by_company_id(company_id)
 
-        if company_results:
-            answer_dict = {"total_questions_answered": 0, "total_correct_answers": 0}
-            for result in company_results:
-                response_dict = json.loads(result)
-                answer_dict["total_questions_answered"] += response_dict["total_questions_answered"]
-                answer_dict["total_correct_answers"] += response_dict["total_correct_answers"]
-            return await calculate_average_score_redis(answer_dict)
+    async def get_quiz_average_score(self, quiz_id: int, redis: Redis):
+        return await self.get_average_score(AggregateScopeEnum.QUIZ, quiz_id, redis)
 
-        quiz_results = (select(QuizResult).where(QuizResult.company_id == company_id))
 
-        quiz_results = await self.session.execute(quiz_results)
-        quiz_results = quiz_results.scalars().all()
+    async def get_user_average_score(self, user_id: int, redis: Redis):
+        return await self.get_average_score(AggregateScopeEnum.USER, user_id, redis)
 
-        if quiz_results:
-            await save_results_to_redis(quiz_results)
-            return await calculate_average_score_db(quiz_results)
-        else:
-            raise HTTPException(status_code=404, detail="No quiz results found")
+
+    async def get_company_average_score(self, company_id: int, redis: Redis):
+        return await self.get_average_score(AggregateScopeEnum.COMPANY, company_id, redis)
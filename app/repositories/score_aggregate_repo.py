@@ -0,0 +1,57 @@
+from sqlalchemy import select, literal, values, column, exists, Integer
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.db.models import ScoreAggregate
+from app.enums.aggregate_scope import AggregateScopeEnum
+
+
+class ScoreAggregateRepository:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+
+    @staticmethod
+    def build_add_result_query(user_id: int, quiz_id: int, company_id: int,
+                               total_correct_answers: int, total_questions_answered: int, inserted_result):
+        scopes = values(column("scope", ScoreAggregate.scope.type), column("scope_id", Integer), name="scopes").data([
+            (AggregateScopeEnum.QUIZ, quiz_id),
+            (AggregateScopeEnum.USER, user_id),
+            (AggregateScopeEnum.COMPANY, company_id),
+        ])
+        rows = (
+            select(scopes.c.scope,
+                   scopes.c.scope_id,
+                   literal(total_correct_answers),
+                   literal(total_questions_answered),
+                   literal(1))
+            .where(exists(select(inserted_result.c.id)))
+        )
+        query = insert(ScoreAggregate).from_select(
+            ["scope", "scope_id", "total_correct_answers", "total_questions_answered", "attempts_count"], rows
+        )
+        return query.on_conflict_do_update(
+            constraint="uq_score_aggregates_scope_scope_id",
+            set_={
+                "total_correct_answers": ScoreAggregate.total_correct_answers + query.excluded.total_correct_answers,
+                "total_questions_answered": ScoreAggregate.total_questions_answered + query.excluded.total_questions_answered,
+                "attempts_count": ScoreAggregate.attempts_count + query.excluded.attempts_count,
+                "updated_at": func.now(),
+            }
+        )
+
+
+    async def get_aggregate(self, scope: AggregateScopeEnum, scope_id: int):
+        query = (
+            select(ScoreAggregate.total_correct_answers,
+                   ScoreAggregate.total_questions_answered,
+                   ScoreAggregate.attempts_count)
+            .where(ScoreAggregate.scope == scope, ScoreAggregate.scope_id == scope_id)
+        )
+        result = await self.session.execute(query)
+        aggregate = result.one_or_none()
+        if not aggregate:
+            return None
+        return dict(aggregate._mapping)
@@ -1,19 +1,26 @@
-from sqlalchemy.exc import DatabaseError
+from aioredis import Redis
+from sqlalchemy.exc import DatabaseError, IntegrityError
 from fastapi import HTTPException
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from app.db.models import User, Notification
+from app.db.models import User
+from app.enums.notification_status import NotificationStatusEnum
+from app.redis_workflow.token_invalidation import bump_user_generation
+from app.repositories.notification_repo import NotificationRepository
 from app.schemas.users import UserCreateSchema, UserUpdateRequestSchema
 
 from app.services.handlers_errors import get_user_or_404
-from app.services.password_hash import PasswordHasher
+from app.services.password_hash import PasswordHasher, UNUSABLE_PASSWORD
 from app.utils.helpers import check_user_by_username_exist, check_user_by_email_exist
 import logging
 
 logger = logging.getLogger("uvicorn")
 
+USERNAME_CONSTRAINT = "ix_users_username"
+
 
 class UserRepository:
 
@@ -30,7 +37,7 @@ class UserRepository:
 
 
     async def create_user(self, user: UserCreateSchema):
-        hashed_password = PasswordHasher.get_password_hash(user.password)
+        hashed_password = await PasswordHasher.get_password_hash(user.password)
         try:
             if await check_user_by_username_exist(self.session, user.username) or await check_user_by_email_exist(self.session, user.email):
                 raise HTTPException(status_code=409, detail="User already exists")
@@ -45,7 +52,32 @@ class UserRepository:
             raise HTTPException(status_code=400, detail=str(e))
 
 
-    async def update_user(self, user_id: int, user: UserUpdateRequestSchema):
+    async def provision_sso_user(self, email: str, usernames: list[str]):
+        """Insert a passwordless Auth0 user, or return None if the email already exists."""
+        for username in usernames:
+            query = (
+                insert(User)
+                .values(username=username, email=email, hashed_password=UNUSABLE_PASSWORD)
+                .on_conflict_do_nothing(index_elements=[User.email])
+                .returning(User)
+            )
+            try:
+                async with self.session.begin_nested():
+                    db_user = await self.session.scalar(query)
+            except IntegrityError as error:
+                if getattr(error.orig.__cause__, "constraint_name", None) != USERNAME_CONSTRAINT:
+                    raise
+                continue
+
+            await self.session.commit()
+            if db_user is not None:
+                logger.info(f"SSO user provisioned with ID: {db_user.id}")
+            return db_user
+
+        raise HTTPException(status_code=409, detail="User already exists")
+
+
+    async def update_user(self, user_id: int, user: UserUpdateRequestSchema, redis: Redis):
         db_user = await get_user_or_404(session=self.session, id=user_id)
         if not db_user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -55,13 +87,16 @@ class UserRepository:
 
             for field, value in updated_values.items():
                 if field == "password" and value is not None:
-                    value = PasswordHasher.get_password_hash(value)
+                    value = await PasswordHasher.get_password_hash(value)
 
                 if field == "email":
                     raise ValueError("You cannot change your email")
                 setattr(db_user, field, value)
 
+            # Before the commit so an unreachable Redis aborts the change, and after it for late cache fills.
+            await bump_user_generation(redis, db_user.email)
             await self.session.commit()
+            await bump_user_generation(redis, db_user.email)
             await self.session.refresh(db_user)
             logger.info(f"User with ID: {db_user.id} is updated")
             return db_user
@@ -69,14 +104,17 @@ class UserRepository:
             raise HTTPException(status_code=404, detail="User not found")
 
 
-    async def delete_user(self, user_id: int):
+    async def delete_user(self, user_id: int, redis: Redis):
         db_user = await get_user_or_404(session=self.session, id=user_id)
         if not db_user:
             raise HTTPException(status_code=404, detail="User not found")
 
         if db_user:
+            email = db_user.email
+            await bump_user_generation(redis, email)
             await self.session.delete(db_user)
             await self.session.commit()
+            await bump_user_generation(redis, email)
             logger.info(f"User is deleted")
         else:
             raise HTTPException(status_code=404, detail="User not found")
@@ -107,9 +145,8 @@ class UserRepository:
         return user
 
 
-    async def get_messages_for_user(self, user_id: int):
-        notifications = await self.session.execute(select(Notification)
-                                             .filter(Notification.user_id == user_id))
-        messages = notifications.scalars().all()
-        return messages
+    async def get_messages_for_user(self, user_id: int, before_id: int = None,
+                                    status: NotificationStatusEnum = None, limit: int = 10):
+        return await NotificationRepository(session=self.session).get_inbox(user_id=user_id, before_id=before_id,
+                                                                            status=status, limit=limit)
 
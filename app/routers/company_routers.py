@@ -1,21 +1,22 @@
 from typing import List
 
+from aioredis import Redis
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.db.connect_db import get_session
-from app.db.models import User
+from app.db.connect_redis import get_redis
+from app.services.token_cache import UserSnapshot
 from app.repositories.company_repo import CompanyRepository
 from app.repositories.notification_repo import NotificationRepository
 from app.repositories.quizze_repo import QuizRepository
 from app.schemas.company import CompanySchema, CompanyCreateSchema, CompanyUpdateSchema, SendMessageToMemberSchema
-from app.schemas.quizzes import QuizCreateSchema, QuizReadSchema, QuizUpdateSchema, QuizBaseSchema, QuestionUpdateSchema
+from app.schemas.quizzes import QuizCreateSchema, QuizReadSchema, QuizUpdateSchema, QuizCreatedSchema, QuestionUpdateSchema
 from app.schemas.users import UserSchema
 from app.services.check_user_permissions import verify_company_permissions, verify_company_owner, \
     verify_company_owner_or_admin
 from app.services.get_user_from_token import get_current_user_from_token
-from app.utils.tasks import send_message_to_email
 
 
 company_routers = APIRouter(tags=["Company"])
@@ -31,7 +32,7 @@ async def list_companies_router(skip: int = 0, limit: int = 10, session: AsyncSe
 @company_routers.get(path="/companies/{company_id}/", response_model=CompanySchema)
 async def get_company_by_id(company_id: int,
                             session: AsyncSession = Depends(get_session),
-                            current_user: User = Depends(get_current_user_from_token)):
+                            current_user: UserSnapshot = Depends(get_current_user_from_token)):
     company_repo = CompanyRepository(session=session)
     company = await company_repo.get_company(company_id=company_id, current_user=current_user)
     return company
@@ -41,7 +42,7 @@ async def get_company_by_id(company_id: int,
 @company_routers.post(path="/companies/", response_model=CompanySchema, status_code=status.HTTP_201_CREATED)
 async def create_company(company_data: CompanyCreateSchema,
                          session: AsyncSession = Depends(get_session),
-                         current_user: User = Depends(get_current_user_from_token)):
+                         current_user: UserSnapshot = Depends(get_current_user_from_token)):
     company_repo = CompanyRepository(session=session)
     new_company = await company_repo.create_company(company=company_data, current_user=current_user)
     return new_company
@@ -93,25 +94,28 @@ async def delete_company(company_id: int, session: AsyncSession = Depends(get_se
                      dependencies=[Depends(verify_company_owner_or_admin)])
 async def send_message_to_company_member(company_id: int,
                                          message: SendMessageToMemberSchema,
-                                         session: AsyncSession = Depends(get_session)):
+                                         session: AsyncSession = Depends(get_session),
+                                         redis: Redis = Depends(get_redis)):
     company_member = await CompanyRepository(session=session).find_company_member(company_id=company_id, username=message.username)
-    send_message_to_email.delay(user_email=company_member.email,
-                                username=company_member.username,
-                                message_text=message.message_text)
-    await NotificationRepository(session=session).save_message_to_db(user_id=company_member.id, message=message.message_text)
+    await NotificationRepository(session=session).save_message_to_db(user_id=company_member.id,
+                                                                      message=message.message_text,
+                                                                      redis=redis,
+                                                                      email_to={"email": company_member.email,
+                                                                                "username": company_member.username})
     return {"message": f"Message sent to user- {company_member.username}"}
 
 # _____________________________________________________________________________________________________
 
 @company_routers.post(path="/companies/{company_id}/quizzes/",
-                      response_model=QuizBaseSchema,
+                      response_model=QuizCreatedSchema,
                       status_code=status.HTTP_201_CREATED,
                       dependencies=[Depends(verify_company_owner_or_admin)])
 async def create_quiz_for_company(company_id: int,
                                   quiz_data: QuizCreateSchema,
-                                  session: AsyncSession = Depends(get_session)):
+                                  session: AsyncSession = Depends(get_session),
+                                  redis: Redis = Depends(get_redis)):
     quiz_repo = QuizRepository(session=session)
-    new_quiz = await quiz_repo.create_quiz(company_id=company_id, quiz_data=quiz_data)
+    new_quiz = await quiz_repo.create_quiz(company_id=company_id, quiz_data=quiz_data, redis=redis)
     return new_quiz
 
 
@@ -133,10 +137,11 @@ async def get_quizzes_for_company(company_id: int,
 async def update_quiz(
     quiz_id: int,
     quiz_data: QuizUpdateSchema,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis)
 ):
     quiz_repo = QuizRepository(session=session)
-    updated_quiz = await quiz_repo.update_quiz(quiz_id=quiz_id, quiz_data=quiz_data)
+    updated_quiz = await quiz_repo.update_quiz(quiz_id=quiz_id, quiz_data=quiz_data, redis=redis)
     return updated_quiz
 
 
@@ -146,10 +151,11 @@ async def update_quiz(
 async def update_questions(
     quiz_id: int,
     questions_data: List[QuestionUpdateSchema],
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis)
 ):
     quiz_repo = QuizRepository(session=session)
-    updated_quiz = await quiz_repo.update_questions(quiz_id=quiz_id, question_data_list=questions_data)
+    updated_quiz = await quiz_repo.update_questions(quiz_id=quiz_id, question_data_list=questions_data, redis=redis)
     return updated_quiz
 
 
@@ -157,7 +163,8 @@ async def update_questions(
                         status_code=status.HTTP_204_NO_CONTENT,
                         dependencies=[Depends(verify_company_owner_or_admin)])
 async def delete_quiz(quiz_id: int,
-                      session: AsyncSession = Depends(get_session)):
+                      session: AsyncSession = Depends(get_session),
+                      redis: Redis = Depends(get_redis)):
     quiz_repo = QuizRepository(session=session)
-    await quiz_repo.delete_quiz(quiz_id=quiz_id)
+    await quiz_repo.delete_quiz(quiz_id=quiz_id, redis=redis)
     return {"message": "Quiz was deleted" }
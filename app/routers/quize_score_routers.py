@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends
+from typing import List
+
+from aioredis import Redis
+from fastapi import APIRouter, Depends, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
 
 from app.db.connect_db import get_session
-from app.db.models import User
+from app.db.connect_redis import get_redis
+from app.services.token_cache import UserSnapshot
+from app.redis_workflow.quiz_version import get_quiz_version
 from app.repositories.results_repo import ResultsRepository
 from app.schemas.quizzes import QuizQuestionsSchema
-from app.schemas.result_quizes import QuizAttemptSchema, QuizResultSchema
+from app.schemas.result_quizes import QuizAttemptSchema, QuizResultSchema, DueQuizSchema
 from app.services.check_user_permissions import verify_company_permissions, verify_quiz_permissions, \
     verify_company_owner_or_admin, verify_user_permission
 from app.services.get_user_from_token import get_current_user_from_token
+from app.services.quiz_payload_cache import get_quiz_solve_payload, etag_matches
 
 
 results_router = APIRouter(tags=["Results"])
@@ -18,10 +25,14 @@ results_router = APIRouter(tags=["Results"])
                      response_model=QuizQuestionsSchema,
                      dependencies=[Depends(verify_company_permissions)])
 async def get_quiz_for_solve(quiz_id: int,
-                             session: AsyncSession = Depends(get_session)):
-    repository = ResultsRepository(session)
-    quiz = await repository.get_quiz_for_solve_repo(quiz_id=quiz_id)
-    return quiz
+                             if_none_match: str | None = Header(default=None),
+                             session: AsyncSession = Depends(get_session),
+                             redis: Redis = Depends(get_redis)):
+    version = await get_quiz_version(redis, quiz_id)
+    etag, payload = await get_quiz_solve_payload(session=session, redis=redis, quiz_id=quiz_id, version=version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
 
 
 @results_router.post(path="/{company_id}/quiz-attempt/",
@@ -30,11 +41,13 @@ async def get_quiz_for_solve(quiz_id: int,
 async def quiz_attempt(quiz_attempt: QuizAttemptSchema,
                        company_id: int,
                        session: AsyncSession = Depends(get_session),
-                       current_user: User = Depends(get_current_user_from_token)):
+                       redis: Redis = Depends(get_redis),
+                       current_user: UserSnapshot = Depends(get_current_user_from_token)):
     repository = ResultsRepository(session)
     answer = await repository.calculate_and_save_quiz_result(user_id=current_user.id,
                                                              quiz_attempt=quiz_attempt,
-                                                             company_id=company_id)
+                                                             company_id=company_id,
+                                                             redis=redis)
     return answer
 
 
@@ -42,25 +55,36 @@ async def quiz_attempt(quiz_attempt: QuizAttemptSchema,
 @results_router.get(path="/quiz-average-score/{quiz_id}",
                     response_model=float,
                     dependencies=[Depends(verify_quiz_permissions)])
-async def quiz_average_score(quiz_id: int, session: AsyncSession = Depends(get_session)):
+async def quiz_average_score(quiz_id: int, session: AsyncSession = Depends(get_session),
+                             redis: Redis = Depends(get_redis)):
     repository = ResultsRepository(session)
-    average_score = await repository.get_quiz_average_score(quiz_id)
+    average_score = await repository.get_quiz_average_score(quiz_id, redis)
     return average_score
 
 
 @results_router.get(path="/user-average-score/{user_id}",
                     response_model=float,
                     dependencies=[Depends(verify_user_permission)])
-async def user_average_score(user_id: int, session: AsyncSession = Depends(get_session)):
+async def user_average_score(user_id: int, session: AsyncSession = Depends(get_session),
+                             redis: Redis = Depends(get_redis)):
     repository = ResultsRepository(session)
-    average_score = await repository.get_user_average_score(user_id)
+    average_score = await repository.get_user_average_score(user_id, redis)
     return average_score
 
 
 @results_router.get(path="/company-average-score/{company_id}",
                     response_model=float,
                     dependencies=[Depends(verify_company_owner_or_admin)])
-async def company_average_score(company_id: int, session: AsyncSession = Depends(get_session)):
+async def company_average_score(company_id: int, session: AsyncSession = Depends(get_session),
+                                redis: Redis = Depends(get_redis)):
     repository = ResultsRepository(session)
-    average_score = await repository.get_company_average_score(company_id)
+    average_score = await repository.get_company_average_score(company_id, redis)
     return average_score
+
+
+@results_router.get(path="/me/due-quizzes", response_model=List[DueQuizSchema])
+async def get_due_quizzes(skip: int = 0,
+                          limit: int = 10,
+                          session: AsyncSession = Depends(get_session),
+                          current_user: UserSnapshot = Depends(get_current_user_from_token)):
+    return await ResultsRepository(session).get_due_quizzes(user_id=current_user.id, skip=skip, limit=limit)
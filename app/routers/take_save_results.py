@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import FileResponse
 
 from app.db.connect_db import get_session
-from app.db.models import User
+from app.services.token_cache import UserSnapshot
 from app.repositories.summary_results_repo import SummaryResultsRepository
 from app.schemas.result_quizes import GeneralQuizResultSchema
 from app.services.check_user_permissions import verify_company_owner_or_admin
@@ -17,7 +17,7 @@ total_results_router = APIRouter(tags=["Save Results"])
 
 
 @total_results_router.get(path="/my-results/", response_model=List[GeneralQuizResultSchema])
-async def get_my_total_results(current_user: User = Depends(get_current_user_from_token),
+async def get_my_total_results(current_user: UserSnapshot = Depends(get_current_user_from_token),
                                session: AsyncSession = Depends(get_session)):
     repository = SummaryResultsRepository(session)
     results = await repository.get_user_quiz_results(user_id=current_user.id)
@@ -66,7 +66,7 @@ async def export_quiz_results_csv(company_id: int,
 
 
 @total_results_router.get(path="/user/export/quiz-results/csv")
-async def export_user_results(current_user: User = Depends(get_current_user_from_token),
+async def export_user_results(current_user: UserSnapshot = Depends(get_current_user_from_token),
                               session: AsyncSession = Depends(get_session)):
     repository = SummaryResultsRepository(session)
     results = await repository.get_user_quiz_results(user_id=current_user.id)
@@ -1,19 +1,26 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, status, Security
+from aioredis import Redis
+from fastapi import APIRouter, Depends, status, Security, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.connect_db import get_session
-from app.db.models import User
+from app.db.connect_redis import get_redis_pool_stats, get_redis
+from app.services.token_cache import UserSnapshot
+from app.enums.notification_status import NotificationStatusEnum
 from app.repositories.notification_repo import NotificationRepository
-from app.schemas.notifications import NotificationSchema, NotificationReadSchema
+from app.schemas.notifications import NotificationSchema, NotificationReadSchema, UnreadCountSchema, \
+    NotificationSelectionSchema
 from app.schemas.users import UserSchema, UserCreateSchema, UserUpdateRequestSchema, Token
 from app.repositories.user_repo import UserRepository
 from app.services.auth import authenticate_user
 from app.services.check_user_permissions import verify_user_permission
 from app.services.create_token import create_access_token
 from app.services.get_user_from_token import get_current_user_from_token
+from app.services.notification_stream import stream_notifications
+from app.services.password_hash import PasswordHasher
 from app.utils.token_verify import VerifyToken
 
 
@@ -31,6 +38,16 @@ def health_check():
     }
 
 
+@user_router.get("/health/redis-pool")
+async def redis_pool_stats(redis: Redis = Depends(get_redis)):
+    return {"ping": await redis.ping(), **get_redis_pool_stats()}
+
+
+@user_router.get("/health/password-hasher")
+async def password_hasher_stats():
+    return PasswordHasher.get_stats()
+
+
 @user_router.get(path="/users/", response_model=List[UserSchema], status_code=200)
 async def get_all_users_router(skip: int = 0, limit: int = 10,
                                session: AsyncSession = Depends(get_session)):
@@ -56,16 +73,18 @@ async def create_user_router(user: UserCreateSchema, session: AsyncSession = Dep
 @user_router.patch(path="/users/{user_id}", response_model=UserSchema, status_code=200, dependencies=[Depends(verify_user_permission)])
 async def update_user_router(user: UserUpdateRequestSchema,
                              session: AsyncSession = Depends(get_session),
-                             current_user: User = Depends(get_current_user_from_token)):
+                             redis: Redis = Depends(get_redis),
+                             current_user: UserSnapshot = Depends(get_current_user_from_token)):
     repo = UserRepository(session=session)
-    updated_user = await repo.update_user(user_id=current_user.id, user=user)
+    updated_user = await repo.update_user(user_id=current_user.id, user=user, redis=redis)
     return updated_user
 
 
 
 @user_router.delete(path="/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(verify_user_permission)])
-async def delete_user_router(session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user_from_token)):
-    await UserRepository(session=session).delete_user(user_id=current_user.id)
+async def delete_user_router(session: AsyncSession = Depends(get_session), redis: Redis = Depends(get_redis),
+                             current_user: UserSnapshot = Depends(get_current_user_from_token)):
+    await UserRepository(session=session).delete_user(user_id=current_user.id, redis=redis)
 
 
 
@@ -77,7 +96,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
 
 @user_router.get(path="/me", response_model=UserSchema)
-async def get_user_from_token_router(current_user: User = Depends(get_current_user_from_token)):
+async def get_user_from_token_router(current_user: UserSnapshot = Depends(get_current_user_from_token)):
     return current_user
 
 
@@ -87,15 +106,59 @@ async def private(auth_result: str = Security(auth.verify)):
 
 
 @user_router.get(path="/my-incoming-messages", response_model=List[NotificationSchema])
-async def get_all_user_messages_router(session: AsyncSession = Depends(get_session),
-                                       current_user: User = Depends(get_current_user_from_token)):
-    all_messages = await UserRepository(session=session).get_messages_for_user(user_id=current_user.id)
+async def get_all_user_messages_router(before_id: int | None = None,
+                                       status: NotificationStatusEnum | None = None,
+                                       limit: int = Query(default=10, ge=1, le=100),
+                                       session: AsyncSession = Depends(get_session),
+                                       current_user: UserSnapshot = Depends(get_current_user_from_token)):
+    all_messages = await UserRepository(session=session).get_messages_for_user(user_id=current_user.id,
+                                                                               before_id=before_id,
+                                                                               status=status,
+                                                                               limit=limit)
     return all_messages
 
 
+@user_router.get(path="/my-incoming-messages/unread-count", response_model=UnreadCountSchema)
+async def get_unread_count_router(session: AsyncSession = Depends(get_session),
+                                  redis: Redis = Depends(get_redis),
+                                  current_user: UserSnapshot = Depends(get_current_user_from_token)):
+    return await NotificationRepository(session=session).get_unread_count(user_id=current_user.id, redis=redis)
+
+
+@user_router.get(path="/my-incoming-messages/stream")
+async def stream_messages_router(request: Request,
+                                 session: AsyncSession = Depends(get_session),
+                                 current_user: UserSnapshot = Depends(get_current_user_from_token)):
+    company_roles = await NotificationRepository(session=session).get_company_roles(user_id=current_user.id)
+    return StreamingResponse(stream_notifications(request=request, user_id=current_user.id, company_roles=company_roles),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@user_router.patch(path="/my-incoming-messages", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_as_read_messages_router(selection: NotificationSelectionSchema,
+                                       session: AsyncSession = Depends(get_session),
+                                       redis: Redis = Depends(get_redis),
+                                       current_user: UserSnapshot = Depends(get_current_user_from_token)):
+    await NotificationRepository(session=session).mark_messages_as_read(user_id=current_user.id, selection=selection,
+                                                                       redis=redis)
+
+
+@user_router.delete(path="/my-incoming-messages", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_messages_router(selection: NotificationSelectionSchema,
+                                 session: AsyncSession = Depends(get_session),
+                                 redis: Redis = Depends(get_redis),
+                                 current_user: UserSnapshot = Depends(get_current_user_from_token)):
+    await NotificationRepository(session=session).delete_messages(user_id=current_user.id, selection=selection,
+                                                                  redis=redis)
+
+
 @user_router.patch(path="/my-incoming-messages/{message_id}", response_model=NotificationReadSchema)
 async def mark_as_read_message_router(message_id: int,
                                       session: AsyncSession = Depends(get_session),
-                                      current_user: User = Depends(get_current_user_from_token)):
-    read_message = await NotificationRepository(session=session).mark_message_as_read(message_id=message_id, user_id=current_user.id)
+                                      redis: Redis = Depends(get_redis),
+                                      current_user: UserSnapshot = Depends(get_current_user_from_token)):
+    read_message = await NotificationRepository(session=session).mark_message_as_read(message_id=message_id,
+                                                                                      user_id=current_user.id,
+                                                                                      redis=redis)
     return read_message
@@ -1,11 +1,15 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist, model_validator
+
+from app.enums.notification_status import NotificationStatusEnum
 
 
 class NotificationSchema(BaseModel):
     id: int
     message: str
+    status: NotificationStatusEnum
+    created_at: datetime
 
     class Config:
         from_attributes = True
@@ -18,4 +22,18 @@ class NotificationReadSchema(BaseModel):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class UnreadCountSchema(BaseModel):
+    unread_count: int
+
+
+class NotificationSelectionSchema(BaseModel):
+    ids: conlist(int, min_length=1, max_length=500) | None = None
+    up_to_id: int | None = None
+
+    @model_validator(mode='after')
+    def validate_selection(self):
+        if (self.ids is None) == (self.up_to_id is None):
+            raise ValueError('Provide either ids or up_to_id')
+        return self
@@ -70,6 +70,10 @@ class QuizCreateSchema(QuizBaseSchema):
     pass
 
 
+class QuizCreatedSchema(QuizBaseSchema):
+    notified_members: int
+
+
 class QuizUpdateSchema(BaseModel):
     title: str
     description: Optional[str]
@@ -31,4 +31,15 @@ class GeneralQuizResultSchema(BaseModel):
     solved_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class DueQuizSchema(BaseModel):
+    quiz_id: int
+    title: str
+    company_id: int
+    last_attempt_at: datetime
+    next_due_at: datetime
+
+    class Config:
+        from_attributes = True
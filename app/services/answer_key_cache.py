@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from typing import Tuple
+
+from aioredis import Redis
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from starlette import status
+
+from app.core.config import settings
+from app.db.models import Quiz, Question
+from app.redis_workflow.quiz_version import get_quiz_version, bump_quiz_version
+from app.services.results_for_quiz import AnswerKey
+
+
+ANSWER_KEY_TTL = 24 * 3600
+
+
+class AnswerKeyLRU:
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[Tuple[int, int], AnswerKey]" = OrderedDict()
+
+
+    def get(self, quiz_id: int, version: int):
+        answer_key = self.entries.get((quiz_id, version))
+        if answer_key is not None:
+            self.entries.move_to_end((quiz_id, version))
+        return answer_key
+
+
+    def put(self, quiz_id: int, version: int, answer_key: AnswerKey):
+        self.entries[(quiz_id, version)] = answer_key
+        self.entries.move_to_end((quiz_id, version))
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+    def discard(self, quiz_id: int):
+        for cache_key in [cache_key for cache_key in self.entries if cache_key[0] == quiz_id]:
+            del self.entries[cache_key]
+
+
+local_answer_keys = AnswerKeyLRU(maxsize=settings.ANSWER_KEY_CACHE_SIZE)
+
+
+def get_answer_key_redis_key(quiz_id: int, version: int) -> str:
+    return f"answer_key:{quiz_id}:{version}"
+
+
+async def load_answer_key_from_db(session: AsyncSession, quiz_id: int) -> AnswerKey:
+    query = (
+        select(Quiz)
+        .options(selectinload(Quiz.questions).selectinload(Question.options))
+        .where(Quiz.id == quiz_id)
+    )
+    result = await session.execute(query)
+    quiz = result.scalar_one_or_none()
+    if not quiz:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
+    return AnswerKey.from_quiz(quiz)
+
+
+async def get_answer_key(session: AsyncSession, redis: Redis, quiz_id: int) -> AnswerKey:
+    """Look in the process LRU, then Redis, then Postgres; keys carry the quiz content version."""
+    version = await get_quiz_version(redis, quiz_id)
+    answer_key = local_answer_keys.get(quiz_id, version)
+    if answer_key is not None:
+        return answer_key
+
+    redis_key = get_answer_key_redis_key(quiz_id, version)
+    cached_answer_key = await redis.get(redis_key)
+    if cached_answer_key:
+        answer_key = AnswerKey.from_json(cached_answer_key)
+    else:
+        answer_key = await load_answer_key_from_db(session, quiz_id)
+        await redis.set(redis_key, answer_key.to_json(), ex=ANSWER_KEY_TTL)
+
+    local_answer_keys.put(quiz_id, version, answer_key)
+    return answer_key
+
+
+async def invalidate_answer_key(redis: Redis, quiz_id: int):
+    local_answer_keys.discard(quiz_id)
+    await bump_quiz_version(redis, quiz_id)
@@ -4,12 +4,13 @@ from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.connect_db import get_session
-from app.db.models import User, CompanyMember, Quiz
+from app.db.models import CompanyMember, Quiz
 from app.enums.roles_users import RoleEnum
 from app.services.get_user_from_token import get_current_user_from_token
+from app.services.token_cache import UserSnapshot
 
 
-async def verify_user_permission(user_id: int, current_user: User = Depends(get_current_user_from_token)):
+async def verify_user_permission(user_id: int, current_user: UserSnapshot = Depends(get_current_user_from_token)):
     if user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -19,7 +20,7 @@ async def verify_user_permission(user_id: int, current_user: User = Depends(get_
 
 async def verify_company_permissions(company_id: int,
                                      session: AsyncSession = Depends(get_session),
-                                     current_user: User = Depends(get_current_user_from_token)):
+                                     current_user: UserSnapshot = Depends(get_current_user_from_token)):
     result = await session.execute(select(CompanyMember).filter((CompanyMember.company_id == company_id) &
                                                                 (CompanyMember.user_id == current_user.id)))
     company_member = result.scalars().first()
@@ -39,7 +40,7 @@ async def verify_company_permissions(company_id: int,
 
 
 async def verify_company_owner(session: AsyncSession = Depends(get_session),
-                               current_user: User = Depends(get_current_user_from_token)):
+                               current_user: UserSnapshot = Depends(get_current_user_from_token)):
     result = await session.execute(
         select(CompanyMember).filter(
             CompanyMember.user_id == current_user.id,
@@ -59,7 +60,7 @@ async def verify_company_owner(session: AsyncSession = Depends(get_session),
 
 async def verify_company_owner_or_admin(company_id: int,
                                         session: AsyncSession = Depends(get_session),
-                                        current_user: User = Depends(get_current_user_from_token)):
+                                        current_user: UserSnapshot = Depends(get_current_user_from_token)):
     result = await session.execute(
         select(CompanyMember).filter(
             (CompanyMember.user_id == current_user.id) &
@@ -79,7 +80,7 @@ async def verify_company_owner_or_admin(company_id: int,
 
 async def verify_quiz_permissions(quiz_id: int,
                                   session: AsyncSession = Depends(get_session),
-                                  current_user: User = Depends(get_current_user_from_token)):
+                                  current_user: UserSnapshot = Depends(get_current_user_from_token)):
     result = await session.execute(select(Quiz).filter(Quiz.id == quiz_id))
     quiz = result.scalars().first()
 
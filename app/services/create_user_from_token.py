@@ -1,16 +1,18 @@
-from datetime import datetime
+import hashlib
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.users import UserCreateSchema
 from app.repositories.user_repo import UserRepository
+from app.utils.helpers import check_user_by_email_exist
 
 
 async def create_user_from_auth_token(session: AsyncSession, email: str):
     username = "auth0" + email.split("@")[0]
-    password_prefix = "Auth0!" + datetime.now().strftime("%Y%m%d%H%M")
-    password = password_prefix + email.split("@")[0]
-    new_user_schema = UserCreateSchema(username=username, email=email, password=password)
+    suffix = hashlib.sha256(email.encode()).hexdigest()[:8]
 
-    user_new = await UserRepository(session=session).create_user(new_user_schema)
+    user_new = await UserRepository(session=session).provision_sso_user(email=email,
+                                                                        usernames=[username, f"{username}_{suffix}"])
+    if user_new is None:
+        user_new = await check_user_by_email_exist(session=session, email=email)
 
-    return user_new
\ No newline at end of file
+    return user_new
@@ -1,4 +1,5 @@
 from datetime import datetime
+from aioredis import Redis
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer
 from jose import JWTError
@@ -9,14 +10,21 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.connect_db import get_session
+from app.db.connect_redis import get_redis
 from app.utils.exeptions_auth import UnauthorizedException
 from app.utils.helpers import check_user_by_email_exist
 from app.services.create_user_from_token import create_user_from_auth_token
+from app.services.token_cache import token_cache, UserSnapshot
 
 oauth2_scheme = HTTPBearer()
 
 
-async def get_current_user_from_token(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)):
+async def get_current_user_from_token(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session),
+                                      redis: Redis = Depends(get_redis)):
+    cached = await token_cache.get(redis, token.credentials)
+    if cached is not None:
+        return cached.user
+
     try:
         payload = jwt.decode(
             token.credentials,
@@ -26,12 +34,13 @@ async def get_current_user_from_token(token: str = Depends(oauth2_scheme), sessi
             issuer=settings.AUTH0_ISSUER,
         )
         email: str = payload.get("email")
+        # Read before the user is loaded, so a change committed meanwhile invalidates this entry.
+        generation = await token_cache.get_generation(redis, email)
 
         exists_user = await check_user_by_email_exist(session=session, email=email)
 
         if not exists_user:
-            creation_user = await create_user_from_auth_token(session=session, email=email)
-            return creation_user
+            current_user = await create_user_from_auth_token(session=session, email=email)
         else:
             expiration_time = datetime.fromtimestamp(payload.get("exp"))
             current_time = datetime.now()
@@ -39,10 +48,14 @@ async def get_current_user_from_token(token: str = Depends(oauth2_scheme), sessi
             if expiration_time < current_time:
                 raise HTTPException(status_code=401, detail="Token has expired")
 
-            return exists_user
+            current_user = exists_user
 
     except ExpiredSignatureError:
         raise UnauthorizedException(detail="Token has expired")
 
     except JWTError:
         raise UnauthorizedException(detail="Could not validate credentials")
+
+    user = UserSnapshot.from_user(current_user)
+    token_cache.put(token.credentials, generation=generation, claims=payload, user=user)
+    return user
@@ -58,7 +58,7 @@ class InvitesServices:
         if invited_user.id != current_user.id:
             raise HTTPException(status_code=403, detail="You don't have an invitation")
 
-        company_member = CompanyMember(user=current_user, company=company, role=RoleEnum.MEMBER)
+        company_member = CompanyMember(user=invited_user, company=company, role=RoleEnum.MEMBER)
         session.add(company_member)
         invite.status = InviteStatusEnum.INVITE
         await session.commit()
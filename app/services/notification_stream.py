@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+import aioredis
+from fastapi import Request
+
+from app.db.connect_redis import get_redis_connection
+from app.redis_workflow.notification_events import get_user_channel, get_company_channel
+
+
+logger = logging.getLogger("uvicorn")
+
+STREAM_QUEUE_SIZE = 100
+STREAM_KEEPALIVE_SECONDS = 15
+STREAM_RETRY_MILLISECONDS = 5000
+
+
+class NotificationHub:
+
+    def __init__(self, queue_size: int = STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.listeners: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self.stale_channels: set[str] = set()
+        self.pubsub = None
+        self.reader: asyncio.Task | None = None
+        self.lock = asyncio.Lock()
+
+
+    async def subscribe(self, channels: list[str]) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        async with self.lock:
+            new_channels = [channel for channel in channels if channel not in self.listeners]
+            for channel in channels:
+                self.listeners[channel].add(queue)
+            self.stale_channels.difference_update(channels)
+            if new_channels:
+                if self.pubsub is None:
+                    redis = await get_redis_connection()
+                    self.pubsub = redis.pubsub()
+                await self.pubsub.subscribe(*new_channels)
+            if self.reader is None or self.reader.done():
+                self.reader = asyncio.create_task(self.read_messages())
+        return queue
+
+
+    def unsubscribe(self, channels: list[str], queue: asyncio.Queue):
+        # Synchronous: it runs while a disconnected stream is cancelled, so the reader task unsubscribes.
+        for channel in channels:
+            listeners = self.listeners.get(channel)
+            if listeners is None:
+                continue
+            listeners.discard(queue)
+            if not listeners:
+                del self.listeners[channel]
+                self.stale_channels.add(channel)
+
+
+    async def read_messages(self):
+        while True:
+            try:
+                if self.stale_channels:
+                    async with self.lock:
+                        stale_channels, self.stale_channels = self.stale_channels, set()
+                        await self.pubsub.unsubscribe(*stale_channels)
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except (aioredis.ConnectionError, aioredis.TimeoutError) as error:
+                logger.warning(f"Notification pub/sub connection lost: {error}")
+                await asyncio.sleep(1)
+                continue
+
+            if not message or message["type"] != "message":
+                continue
+            for queue in tuple(self.listeners.get(message["channel"], ())):
+                try:
+                    queue.put_nowait((message["channel"], message["data"]))
+                except asyncio.QueueFull:
+                    pass
+
+
+    async def close(self):
+        if self.reader is not None:
+            self.reader.cancel()
+            self.reader = None
+        if self.pubsub is not None:
+            await self.pubsub.close()
+            self.pubsub = None
+        self.listeners.clear()
+        self.stale_channels.clear()
+
+
+notification_hub = NotificationHub()
+
+
+async def stream_notifications(request: Request, user_id: int, company_roles: dict[int, str]):
+    channel_roles = {get_company_channel(company_id): role for company_id, role in company_roles.items()}
+    channels = [get_user_channel(user_id), *channel_roles]
+    queue = await notification_hub.subscribe(channels)
+    try:
+        yield f"retry: {STREAM_RETRY_MILLISECONDS}\n\n"
+        while not await request.is_disconnected():
+            try:
+                channel, data = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            event = json.loads(data)
+            role = event.pop("role")
+            if role is not None and channel_roles.get(channel) != role:
+                continue
+            yield f"id: {event['id']}\nevent: notification\ndata: {json.dumps(event)}\n\n"
+    finally:
+        notification_hub.unsubscribe(channels, queue)
@@ -1,14 +1,58 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
+from starlette import status
+
+from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Stored instead of a hash for accounts that sign in only through Auth0; no password ever matches it.
+UNUSABLE_PASSWORD = "!sso"
+
+hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
 
 class PasswordHasher:
-    @staticmethod
-    def verify_password(plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+    in_flight = 0
+
+    @classmethod
+    async def run_in_executor(cls, function, *args):
+        """Run a bcrypt call on the bounded hashing pool, shedding load once too many are waiting."""
+        if cls.get_queue_depth() >= settings.PASSWORD_HASH_MAX_QUEUE:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Too many password checks in progress, try again later")
+        cls.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(hash_executor, function, *args)
+        finally:
+            cls.in_flight -= 1
+
+
+    @classmethod
+    def get_queue_depth(cls) -> int:
+        return max(cls.in_flight - settings.PASSWORD_HASH_WORKERS, 0)
+
+
+    @classmethod
+    def get_stats(cls):
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "in_flight": cls.in_flight,
+            "queue_depth": cls.get_queue_depth(),
+            "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+        }
+
+
+    @classmethod
+    async def verify_password(cls, plain_password, hashed_password):
+        if hashed_password == UNUSABLE_PASSWORD:
+            return False
+        return await cls.run_in_executor(pwd_context.verify, plain_password, hashed_password)
 
 
-    @staticmethod
-    def get_password_hash(password: str):
-        return pwd_context.hash(password)
+    @classmethod
+    async def get_password_hash(cls, password: str):
+        return await cls.run_in_executor(pwd_context.hash, password)
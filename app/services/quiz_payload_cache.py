@@ -0,0 +1,38 @@
+import hashlib
+
+from aioredis import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.results_repo import ResultsRepository
+from app.schemas.quizzes import QuizQuestionsSchema
+
+
+QUIZ_PAYLOAD_TTL = 24 * 3600
+
+
+def get_quiz_payload_redis_key(quiz_id: int, version: int) -> str:
+    return f"quiz_solve:{quiz_id}:{version}"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+async def get_quiz_solve_payload(session: AsyncSession, redis: Redis, quiz_id: int, version: int):
+    redis_key = get_quiz_payload_redis_key(quiz_id, version)
+    cached_payload = await redis.hgetall(redis_key)
+    if cached_payload:
+        return cached_payload["etag"], cached_payload["payload"]
+
+    quiz = await ResultsRepository(session).get_quiz_for_solve_repo(quiz_id=quiz_id)
+    payload = QuizQuestionsSchema.model_validate(quiz, from_attributes=True).model_dump_json()
+    etag = f'"{hashlib.sha1(payload.encode()).hexdigest()}"'
+
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(redis_key, mapping={"etag": etag, "payload": payload})
+        pipe.expire(redis_key, QUIZ_PAYLOAD_TTL)
+        await pipe.execute()
+    return etag, payload
@@ -1,18 +1,69 @@
-from typing import List
+import json
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import List, Tuple, NamedTuple
 from app.db.models import Quiz
 from app.schemas.result_quizes import AnswerSchema
 
 
-def calculate_quiz_score(quiz: Quiz, answers: List[AnswerSchema]) -> float:
-    questions_dict = {question.id: question for question in quiz.questions}
-    total_questions = len(questions_dict)
-    correct_answers = 0
+class QuizGrade(NamedTuple):
+    score: float
+    total_correct_answers: int
+    total_questions_answered: int
 
-    for answer in answers:
-        question = questions_dict.get(answer.question_id)
-        if question:
-            option = next((o for o in question.options if o.id == answer.option_id and o.is_correct), None)
-            if option:
-                correct_answers += 1
 
-    return (correct_answers / total_questions) * 100
+@dataclass(frozen=True)
+class AnswerKey:
+    """Sorted question ids, each aligned with the sorted ids of its correct options."""
+    quiz_id: int
+    company_id: int
+    frequency_days: int
+    question_ids: Tuple[int, ...]
+    correct_option_ids: Tuple[Tuple[int, ...], ...]
+
+    @classmethod
+    def from_quiz(cls, quiz: Quiz) -> "AnswerKey":
+        questions = sorted(quiz.questions, key=lambda question: question.id)
+        return cls(quiz_id=quiz.id,
+                   company_id=quiz.company_id,
+                   frequency_days=quiz.frequency_days,
+                   question_ids=tuple(question.id for question in questions),
+                   correct_option_ids=tuple(
+                       tuple(sorted(option.id for option in question.options if option.is_correct))
+                       for question in questions
+                   ))
+
+    @classmethod
+    def from_json(cls, data: str) -> "AnswerKey":
+        fields = json.loads(data)
+        return cls(quiz_id=fields["quiz_id"],
+                   company_id=fields["company_id"],
+                   frequency_days=fields["frequency_days"],
+                   question_ids=tuple(fields["question_ids"]),
+                   correct_option_ids=tuple(tuple(option_ids) for option_ids in fields["correct_option_ids"]))
+
+    def to_json(self) -> str:
+        return json.dumps({"quiz_id": self.quiz_id,
+                           "company_id": self.company_id,
+                           "frequency_days": self.frequency_days,
+                           "question_ids": self.question_ids,
+                           "correct_option_ids": self.correct_option_ids})
+
+    def is_correct(self, question_id: int, option_id: int) -> bool:
+        position = bisect_left(self.question_ids, question_id)
+        if position == len(self.question_ids) or self.question_ids[position] != question_id:
+            return False
+        option_ids = self.correct_option_ids[position]
+        option_position = bisect_left(option_ids, option_id)
+        return option_position < len(option_ids) and option_ids[option_position] == option_id
+
+
+def grade_quiz_attempt(answer_key: AnswerKey, answers: List[AnswerSchema]) -> QuizGrade:
+    total_questions = len(answer_key.question_ids)
+    chosen_options = {answer.question_id: answer.option_id for answer in answers}
+    correct_answers = sum(
+        1 for question_id, option_id in chosen_options.items()
+        if answer_key.is_correct(question_id, option_id)
+    )
+    score = (correct_answers / total_questions) * 100 if total_questions else 0.0
+    return QuizGrade(score=score, total_correct_answers=correct_answers, total_questions_answered=total_questions)
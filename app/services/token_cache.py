@@ -0,0 +1,87 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import aioredis
+from aioredis import Redis
+
+from app.core.config import settings
+from app.db.models import User
+from app.redis_workflow.token_invalidation import get_user_generation
+
+
+logger = logging.getLogger("uvicorn")
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    id: int
+    username: str
+    email: str
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(id=user.id, username=user.username, email=user.email, is_admin=user.is_admin)
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    expires_at: float
+    generation: int
+    claims: dict
+    user: UserSnapshot
+
+
+class TokenCache:
+    """Per-process LRU of verified tokens, invalidated by the user's generation in Redis."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: OrderedDict[str, CachedToken] = OrderedDict()
+
+
+    @staticmethod
+    def get_key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+
+    async def get(self, redis: Redis, token: str) -> CachedToken | None:
+        key = self.get_key(token)
+        cached = self.entries.get(key)
+        if cached is None:
+            return None
+        if cached.expires_at <= time.time():
+            del self.entries[key]
+            return None
+        if await self.get_generation(redis, cached.user.email) != cached.generation:
+            self.entries.pop(key, None)
+            return None
+        self.entries.move_to_end(key)
+        return cached
+
+
+    async def get_generation(self, redis: Redis, email: str) -> int | None:
+        try:
+            return await get_user_generation(redis, email)
+        except (aioredis.ConnectionError, aioredis.TimeoutError) as error:
+            logger.warning(f"Token cache bypassed, cannot read user generation: {error}")
+            self.entries.clear()
+            return None
+
+
+    def put(self, token: str, generation: int | None, claims: dict, user: UserSnapshot):
+        expires_at = claims.get("exp")
+        if self.max_size <= 0 or expires_at is None or generation is None:
+            return
+        key = self.get_key(token)
+        self.entries[key] = CachedToken(expires_at=expires_at, generation=generation, claims=claims, user=user)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
+
@@ -1,7 +1,41 @@
+import asyncio
+
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
+
 from app.core.config import settings
+from app.db.connect_db import engine
+from app.db.connect_redis import init_redis_pool, close_redis_pool, reset_redis_pool
+from app.utils.smtp_client import smtp_pool
 
 
 celery_app  = Celery(main='tasks', broker=settings.CELERY_BROKER_URL, backend=settings.CELERY_RESULT_BACKEND)
 celery_app.conf.update(broker_connection_retry_on_startup=True)
-celery_app.autodiscover_tasks(['app.utils.tasks'])
\ No newline at end of file
+celery_app.autodiscover_tasks(['app.utils.tasks'])
+
+worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run_in_worker_loop(coroutine):
+    """Run a coroutine on this worker process's loop, which its pooled async clients are bound to."""
+    global worker_loop
+    if worker_loop is None or worker_loop.is_closed():
+        worker_loop = asyncio.new_event_loop()
+    return worker_loop.run_until_complete(coroutine)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    # Connections inherited from the parent belong to another process and event loop.
+    engine.sync_engine.dispose(close=False)
+    reset_redis_pool()
+    init_redis_pool()
+    smtp_pool.reset()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    run_in_worker_loop(close_redis_pool())
+    run_in_worker_loop(engine.dispose())
+    smtp_pool.close()
+    worker_loop.close()
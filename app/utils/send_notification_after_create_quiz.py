@@ -1,21 +1,11 @@
-from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.models import Notification, CompanyMember, Quiz
+from app.db.models import Quiz
 from app.enums.roles_users import RoleEnum
+from app.repositories.notification_repo import NotificationRepository
 
 
 async def send_notifications(session: AsyncSession, quiz: Quiz):
-    query = (
-        select(CompanyMember)
-        .where(and_(CompanyMember.company_id == quiz.company_id, CompanyMember.role == RoleEnum.MEMBER)))
-    result = await session.execute(query)
-    company_members = result.scalars().all()
-
-    for member in company_members:
-        notification = Notification(
-            user_id=member.user_id,
-            message=f"New quiz '{quiz.title}' has been created in your company. Take the quiz!"
-        )
-        session.add(notification)
-
-    await session.commit()
\ No newline at end of file
+    message = f"New quiz '{quiz.title}' has been created in your company. Take the quiz!"
+    return await NotificationRepository(session=session).save_broadcast_to_db(company_id=quiz.company_id,
+                                                                               message=message,
+                                                                               role=RoleEnum.MEMBER)
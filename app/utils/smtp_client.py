@@ -1,4 +1,6 @@
 import smtplib
+import threading
+from contextlib import contextmanager
 from email.message import EmailMessage
 from app.core.config import settings
 
@@ -6,7 +8,13 @@ from app.core.config import settings
 class SMTPClient:
 
     def __init__(self):
-        self.server = smtplib.SMTP(host=settings.GMAIL_HOST, port=settings.GMAIL_PORT)
+        self.server = None
+        self.connect()
+
+
+    def connect(self):
+        self.server = smtplib.SMTP(host=settings.GMAIL_HOST, port=settings.GMAIL_PORT,
+                                   timeout=settings.SMTP_TIMEOUT)
         self.server.starttls()
         self.server.login(user=settings.EMAIL_FROM, password=settings.EMAIL_PASSWORD)
 
@@ -17,18 +25,59 @@ class SMTPClient:
         message['From'] = settings.EMAIL_FROM
         message['To'] = to_email
         message.set_content(content)
-        self.server.send_message(from_addr=settings.EMAIL_FROM, to_addrs=to_email, msg=message)
+        try:
+            self.server.send_message(from_addr=settings.EMAIL_FROM, to_addrs=to_email, msg=message)
+        except smtplib.SMTPServerDisconnected:
+            self.connect()
+            self.server.send_message(from_addr=settings.EMAIL_FROM, to_addrs=to_email, msg=message)
+
+
+    def close(self):
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+
+
+class SMTPConnectionPool:
+
+    def __init__(self, max_idle: int):
+        self.max_idle = max_idle
+        self.idle: list[SMTPClient] = []
+        self.lock = threading.Lock()
+
+
+    @contextmanager
+    def connection(self):
+        with self.lock:
+            client = self.idle.pop() if self.idle else None
+        if client is None:
+            client = SMTPClient()
+
+        try:
+            yield client
+        except Exception:
+            client.close()
+            raise
+
+        with self.lock:
+            if len(self.idle) < self.max_idle:
+                self.idle.append(client)
+                return
+        client.close()
 
 
     def close(self):
-        self.server.quit()
+        with self.lock:
+            clients, self.idle = self.idle, []
+        for client in clients:
+            client.close()
 
 
-class SMTPClientContext:
-    def __enter__(self):
-        self.client = SMTPClient()
-        return self.client
+    def reset(self):
+        """Forget sessions inherited from a parent process without closing its sockets."""
+        with self.lock:
+            self.idle = []
 
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        self.client.close()
+smtp_pool = SMTPConnectionPool(max_idle=settings.SMTP_POOL_SIZE)
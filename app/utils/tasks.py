@@ -1,45 +1,169 @@
+import logging
+import smtplib
+import time
+from collections import Counter
 from datetime import timedelta, datetime
+import aioredis
+from celery import chord
 from celery.schedules import crontab
-from sqlalchemy import select
-from sqlalchemy.sql.expression import lambda_stmt
+from app.core.config import settings
 from app.db.connect_db import AsyncSessionFactory
-from app.db.models import User, QuizResult, Quiz, Notification
+from app.db.connect_redis import get_redis_connection
+from app.db.models import REMINDER_SHARDS
+from app.enums.outbox_kind import OutboxKindEnum
+from app.repositories.outbox_repo import OutboxRepository
+from app.repositories.reminder_repo import ReminderRepository
+from app.redis_workflow.notification_events import publish_notifications
+from app.redis_workflow.rate_limit import take_token
+from app.redis_workflow.unread_counts import adjust_unread_counts
 from app.utils.send_emails import get_email_template_message
-from app.utils.smtp_client import SMTPClientContext
-from app.utils.celery_app import celery_app as celery
+from app.utils.smtp_client import smtp_pool
+from app.utils.celery_app import celery_app as celery, run_in_worker_loop
 
 
-@celery.task
-def send_message_to_email(user_email: str, username: str, message_text: str = None):
-    if not message_text:
-        message_text = get_email_template_message(username)
+REMINDER_CHUNK_SIZE = 1000
+EMAIL_BATCH_SIZE = 100
+OUTBOX_RELAY_BATCH_SIZE = 100
+
+logger = logging.getLogger(__name__)
+
+
+async def take_email_token() -> float:
+    redis = await get_redis_connection()
+    return await take_token(redis, name=f"smtp:{settings.GMAIL_HOST}",
+                            rate=settings.EMAIL_RATE_LIMIT_PER_SECOND,
+                            burst=settings.EMAIL_RATE_LIMIT_BURST)
+
+
+def wait_for_email_token():
+    while True:
+        wait = run_in_worker_loop(take_email_token())
+        if not wait:
+            return
+        time.sleep(wait)
 
-    with SMTPClientContext() as smtp_client:
-        smtp_client.send_email(to_email=user_email, content=message_text)
 
-    return f"Email sent to {username}"
+def is_permanent_failure(error: Exception) -> bool:
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
 
 
 @celery.task
-async def run_user_quiz_check():
+def send_emails_batch(recipients: list[dict], attempt: int = 0):
+    """Recipients are {"email", "username", "message_text" (optional)}; temporary failures are retried."""
+    sent, failed, retry = [], [], []
+    try:
+        with smtp_pool.connection() as smtp_client:
+            for position, recipient in enumerate(recipients):
+                try:
+                    wait_for_email_token()
+                except aioredis.RedisError as error:
+                    logger.warning(f"Email rate limiter unavailable, deferring the rest of the batch: {error}")
+                    deferred = recipients[position:]
+                    failed.extend({"email": pending["email"], "error": str(error), "permanent": False}
+                                  for pending in deferred)
+                    retry.extend(deferred)
+                    break
+                content = recipient.get("message_text") or get_email_template_message(recipient["username"])
+                try:
+                    smtp_client.send_email(to_email=recipient["email"], content=content)
+                except (smtplib.SMTPException, OSError) as error:
+                    permanent = is_permanent_failure(error)
+                    failed.append({"email": recipient["email"], "error": str(error), "permanent": permanent})
+                    if not permanent:
+                        retry.append(recipient)
+                else:
+                    sent.append(recipient["email"])
+    except (smtplib.SMTPException, OSError) as error:
+        # No session could be opened, so nothing was sent.
+        retry = [recipient for recipient in recipients if recipient["email"] not in sent]
+        failed = [{"email": recipient["email"], "error": str(error), "permanent": False} for recipient in retry]
+
+    retry_scheduled = bool(retry) and attempt < settings.EMAIL_MAX_RETRIES
+    if retry_scheduled:
+        send_emails_batch.apply_async(args=(retry,), kwargs={"attempt": attempt + 1},
+                                      countdown=settings.EMAIL_RETRY_DELAY * 2 ** attempt)
+    return {"attempt": attempt, "sent": sent, "failed": failed, "retry_scheduled": retry_scheduled}
+
+
+async def check_overdue_quizzes(now: datetime, shard: int) -> dict:
+    reminded_before = now - timedelta(days=settings.REMINDER_INTERVAL_DAYS)
+    after = (datetime.min, 0)
+    summary = {"pages": 0, "rows_claimed": 0, "reminders_created": 0, "emails_queued": 0}
+    redis = await get_redis_connection()
     async with AsyncSessionFactory() as session:
-        users = await session.execute(select(User))
-        users = users.scalars().all()
+        repo = ReminderRepository(session=session)
+        outbox = OutboxRepository(session=session)
+        while True:
+            overdue_quizzes = await repo.claim_overdue_quizzes(now=now, reminded_before=reminded_before,
+                                                               shard=shard, after=after, limit=REMINDER_CHUNK_SIZE)
+            if not overdue_quizzes:
+                break
+
+            notifications = await repo.save_reminders(overdue_quizzes)
+            emails = [{"email": overdue.email, "username": overdue.username} for overdue in overdue_quizzes]
+            for start in range(0, len(emails), EMAIL_BATCH_SIZE):
+                outbox.add_email_batch(emails[start:start + EMAIL_BATCH_SIZE])
+            await session.commit()
+            await adjust_unread_counts(redis, Counter(notification.user_id for notification in notifications))
+            await publish_notifications(redis, notifications)
+
+            summary["pages"] += 1
+            summary["rows_claimed"] += len(overdue_quizzes)
+            summary["reminders_created"] += len(notifications)
+            summary["emails_queued"] += len(emails)
+            after = (overdue_quizzes[-1].next_due_at, overdue_quizzes[-1].id)
+    return summary
 
-        for user in users:
-            quiz_results = await session.execute(select(QuizResult).where(lambda_stmt(lambda: QuizResult.user_id == user.id)))
-            quiz_results = quiz_results.scalars().all()
 
-            for quiz_result in quiz_results:
-                quiz = await session.get(Quiz, quiz_result.quiz_id)
+@celery.task
+def remind_overdue_quizzes_shard(shard: int, now: str):
+    started = time.monotonic()
+    summary = run_in_worker_loop(check_overdue_quizzes(now=datetime.fromisoformat(now), shard=shard))
+    return {"shard": shard, **summary, "duration_seconds": round(time.monotonic() - started, 3)}
+
+
+@celery.task
+def summarize_reminder_shards(summaries: list[dict]):
+    totals = {field: sum(summary[field] for summary in summaries)
+              for field in ("pages", "rows_claimed", "reminders_created", "emails_queued")}
+    totals["slowest_shard_seconds"] = max(summary["duration_seconds"] for summary in summaries)
+    logger.info(f"Quiz reminder check finished: {totals}")
+    return {"totals": totals, "shards": sorted(summaries, key=lambda summary: summary["shard"])}
+
 
-                if datetime.utcnow() - quiz_result.solved_at > timedelta(days=quiz.frequency_days):
-                    notification_message = f"It's time to take the quiz '{quiz.title}'!"
-                    notification = Notification(user_id=user.id, message=notification_message)
-                    session.add(notification)
-                    await session.commit()
+@celery.task
+def run_user_quiz_check():
+    now = datetime.utcnow().isoformat()
+    chord(remind_overdue_quizzes_shard.s(shard, now) for shard in range(REMINDER_SHARDS))(summarize_reminder_shards.s())
+    return f"Reminder check dispatched to {REMINDER_SHARDS} shards"
 
-                    send_message_to_email.delay(user.email, user.username)
+
+async def relay_outbox_messages() -> int:
+    relayed_count = 0
+    async with AsyncSessionFactory() as session:
+        outbox = OutboxRepository(session=session)
+        while True:
+            messages = await outbox.claim_messages(limit=OUTBOX_RELAY_BATCH_SIZE)
+            if not messages:
+                break
+            try:
+                for message in messages:
+                    if message.kind == OutboxKindEnum.EMAIL_BATCH:
+                        send_emails_batch.delay(message.payload["recipients"])
+            except Exception:
+                await session.rollback()
+                raise
+            await session.commit()
+            relayed_count += len(messages)
+    return relayed_count
+
+
+@celery.task
+def relay_outbox():
+    relayed_count = run_in_worker_loop(relay_outbox_messages())
+    return f"Outbox messages relayed: {relayed_count}"
 
 
 @celery.task
@@ -52,4 +176,6 @@ def test_task():
 celery.add_periodic_task(crontab(hour='0', minute='0', day_of_week='*'),
                          run_user_quiz_check.s(),
                          name='run-every-day-at-midnight')
-celery.add_periodic_task(timedelta(seconds=30), test_task.s(), name='run-test-task')
\ No newline at end of file
+celery.add_periodic_task(timedelta(seconds=30), test_task.s(), name='run-test-task')
+celery.add_periodic_task(timedelta(seconds=settings.OUTBOX_RELAY_INTERVAL), relay_outbox.s(),
+                         name='relay-outbox', expires=settings.OUTBOX_RELAY_INTERVAL)
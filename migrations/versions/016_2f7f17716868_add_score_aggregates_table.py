@@ -0,0 +1,50 @@
+"""Add score aggregates table
+
+Revision ID: 2f7f17716868
+Revises: e1e7f7afb950
+Create Date: 2026-10-18 10:12:41.503127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '2f7f17716868'
+down_revision: Union[str, None] = 'e1e7f7afb950'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('score_aggregates',
+    sa.Column('scope', postgresql.ENUM('QUIZ', 'USER', 'COMPANY', name='aggregate_scope'), nullable=False),
+    sa.Column('scope_id', sa.Integer(), nullable=False),
+    sa.Column('total_correct_answers', sa.BigInteger(), nullable=False),
+    sa.Column('total_questions_answered', sa.BigInteger(), nullable=False),
+    sa.Column('attempts_count', sa.BigInteger(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('scope', 'scope_id', name='uq_score_aggregates_scope_scope_id')
+    )
+    op.create_index(op.f('ix_score_aggregates_id'), 'score_aggregates', ['id'], unique=False)
+
+    for scope, column in (('QUIZ', 'quiz_id'), ('USER', 'user_id'), ('COMPANY', 'company_id')):
+        op.execute(f"""
+            INSERT INTO score_aggregates (scope, scope_id, total_correct_answers, total_questions_answered,
+                                          attempts_count, created_at, updated_at)
+            SELECT '{scope}', {column}, SUM(total_correct_answers), SUM(total_questions_answered),
+                   COUNT(*), now(), now()
+            FROM quiz_results
+            GROUP BY {column}
+        """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_score_aggregates_id'), table_name='score_aggregates')
+    op.drop_table('score_aggregates')
+    op.execute("DROP TYPE aggregate_scope")
@@ -0,0 +1,42 @@
+"""Add composite indexes for foreign key lookups
+
+Revision ID: d6beb3c609ba
+Revises: 2f7f17716868
+Create Date: 2026-10-18 11:03:27.184420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6beb3c609ba'
+down_revision: Union[str, None] = '2f7f17716868'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns, covering columns)
+INDEXES = [
+    ('ix_quiz_results_user_id_quiz_id', 'quiz_results', ['user_id', 'quiz_id', 'solved_at'], None),
+    ('ix_quiz_results_company_id_quiz_id', 'quiz_results', ['company_id', 'quiz_id'], None),
+    ('ix_quiz_results_company_id_user_id', 'quiz_results', ['company_id', 'user_id'], None),
+    ('ix_company_members_company_id_user_id', 'company_members', ['company_id', 'user_id'], ['role']),
+    ('ix_company_members_user_id_role', 'company_members', ['user_id', 'role'], None),
+    ('ix_notifications_user_id_status', 'notifications', ['user_id', 'status'], None),
+    ('ix_invites_user_id_type_invite', 'invites', ['user_id', 'type_invite'], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, include in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True, postgresql_include=include or [])
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
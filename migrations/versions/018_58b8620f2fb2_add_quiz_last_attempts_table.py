@@ -0,0 +1,49 @@
+"""Add quiz last attempts table
+
+Revision ID: 58b8620f2fb2
+Revises: d6beb3c609ba
+Create Date: 2026-10-18 12:20:55.930218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '58b8620f2fb2'
+down_revision: Union[str, None] = 'd6beb3c609ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('quiz_last_attempts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('quiz_id', sa.Integer(), nullable=False),
+    sa.Column('last_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('next_allowed_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'quiz_id', name='uq_quiz_last_attempts_user_id_quiz_id')
+    )
+    op.create_index(op.f('ix_quiz_last_attempts_id'), 'quiz_last_attempts', ['id'], unique=False)
+
+    op.execute("""
+        INSERT INTO quiz_last_attempts (user_id, quiz_id, last_attempt_at, next_allowed_at, created_at, updated_at)
+        SELECT quiz_results.user_id, quiz_results.quiz_id, MAX(quiz_results.solved_at),
+               MAX(quiz_results.solved_at) + make_interval(days => quizzes.frequency_days), now(), now()
+        FROM quiz_results
+        JOIN quizzes ON quizzes.id = quiz_results.quiz_id
+        GROUP BY quiz_results.user_id, quiz_results.quiz_id, quizzes.frequency_days
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_quiz_last_attempts_id'), table_name='quiz_last_attempts')
+    op.drop_table('quiz_last_attempts')
@@ -0,0 +1,54 @@
+"""Add broadcast notifications and read cursors
+
+Revision ID: 37d2fa57af4e
+Revises: 58b8620f2fb2
+Create Date: 2026-10-18 13:41:09.226871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '37d2fa57af4e'
+down_revision: Union[str, None] = '58b8620f2fb2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('broadcast_notifications',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('notifications_id_seq')"), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('role', postgresql.ENUM('ADMIN', 'OWNER', 'MEMBER', name='role', create_type=False), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('message', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_broadcast_notifications_id'), 'broadcast_notifications', ['id'], unique=False)
+    op.create_index('ix_broadcast_notifications_company_id_id', 'broadcast_notifications', ['company_id', 'id'], unique=False)
+    op.create_table('broadcast_read_cursors',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('last_read_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'company_id', name='uq_broadcast_read_cursors_user_id_company_id')
+    )
+    op.create_index(op.f('ix_broadcast_read_cursors_id'), 'broadcast_read_cursors', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_broadcast_read_cursors_id'), table_name='broadcast_read_cursors')
+    op.drop_table('broadcast_read_cursors')
+    op.drop_index('ix_broadcast_notifications_company_id_id', table_name='broadcast_notifications')
+    op.drop_index(op.f('ix_broadcast_notifications_id'), table_name='broadcast_notifications')
+    op.drop_table('broadcast_notifications')
@@ -0,0 +1,43 @@
+"""Add notification inbox indexes
+
+Revision ID: de933ccb1ad3
+Revises: 37d2fa57af4e
+Create Date: 2026-10-18 14:22:51.530214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'de933ccb1ad3'
+down_revision: Union[str, None] = '37d2fa57af4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, columns, partial index predicate)
+INDEXES = [
+    ('ix_notifications_user_id_id', ['user_id', 'id'], None),
+    ('ix_notifications_user_id_id_unread', ['user_id', 'id'], "status = 'UNREAD'"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(name, 'notifications', columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True,
+                            postgresql_where=sa.text(where) if where else None)
+        op.drop_index('ix_notifications_user_id_status', table_name='notifications', if_exists=True,
+                      postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_notifications_user_id_status', 'notifications', ['user_id', 'status'], unique=False,
+                        if_not_exists=True, postgresql_concurrently=True)
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='notifications', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,27 @@
+"""Add cleared_up_to_id to broadcast read cursors
+
+Revision ID: e489c52d6e6a
+Revises: de933ccb1ad3
+Create Date: 2026-10-18 15:02:17.348196
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e489c52d6e6a'
+down_revision: Union[str, None] = 'de933ccb1ad3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('broadcast_read_cursors',
+                  sa.Column('cleared_up_to_id', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('broadcast_read_cursors', 'cleared_up_to_id')
@@ -0,0 +1,31 @@
+"""Rename next_allowed_at to next_due_at and index it
+
+Revision ID: 7b1c9e04d2aa
+Revises: e489c52d6e6a
+Create Date: 2026-10-18 16:10:42.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1c9e04d2aa'
+down_revision: Union[str, None] = 'e489c52d6e6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('quiz_last_attempts', 'next_allowed_at', new_column_name='next_due_at')
+    with op.get_context().autocommit_block():
+        op.create_index('ix_quiz_last_attempts_next_due_at_id', 'quiz_last_attempts', ['next_due_at', 'id'],
+                        unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_quiz_last_attempts_next_due_at_id', table_name='quiz_last_attempts', if_exists=True,
+                      postgresql_concurrently=True)
+    op.alter_column('quiz_last_attempts', 'next_due_at', new_column_name='next_allowed_at')
@@ -0,0 +1,26 @@
+"""Add last_reminded_at to quiz last attempts
+
+Revision ID: a3f5d81e6c47
+Revises: 7b1c9e04d2aa
+Create Date: 2026-10-18 16:48:05.612390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f5d81e6c47'
+down_revision: Union[str, None] = '7b1c9e04d2aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('quiz_last_attempts', sa.Column('last_reminded_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('quiz_last_attempts', 'last_reminded_at')
@@ -0,0 +1,39 @@
+"""Add outbox messages table
+
+Revision ID: 5e0d2b7c91f3
+Revises: a3f5d81e6c47
+Create Date: 2026-10-18 17:31:26.774018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0d2b7c91f3'
+down_revision: Union[str, None] = 'a3f5d81e6c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_messages',
+    sa.Column('kind', postgresql.ENUM('EMAIL_BATCH', name='outbox_kind'), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_outbox_messages_id'), 'outbox_messages', ['id'], unique=False)
+    op.create_index('ix_outbox_messages_available_at_id', 'outbox_messages', ['available_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_available_at_id', table_name='outbox_messages')
+    op.drop_index(op.f('ix_outbox_messages_id'), table_name='outbox_messages')
+    op.drop_table('outbox_messages')
+    postgresql.ENUM(name='outbox_kind').drop(op.get_bind())
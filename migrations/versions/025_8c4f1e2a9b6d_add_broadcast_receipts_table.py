@@ -0,0 +1,38 @@
+"""Add broadcast receipts table
+
+Revision ID: 8c4f1e2a9b6d
+Revises: 5e0d2b7c91f3
+Create Date: 2026-10-19 09:12:44.516302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f1e2a9b6d'
+down_revision: Union[str, None] = '5e0d2b7c91f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('broadcast_receipts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('broadcast_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['broadcast_id'], ['broadcast_notifications.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'broadcast_id', name='uq_broadcast_receipts_user_id_broadcast_id')
+    )
+    op.create_index(op.f('ix_broadcast_receipts_id'), 'broadcast_receipts', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_broadcast_receipts_id'), table_name='broadcast_receipts')
+    op.drop_table('broadcast_receipts')
@@ -0,0 +1,27 @@
+"""Add is_deleted to broadcast receipts
+
+Revision ID: f2a7c3d9e1b4
+Revises: 8c4f1e2a9b6d
+Create Date: 2026-10-19 10:03:27.840165
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c3d9e1b4'
+down_revision: Union[str, None] = '8c4f1e2a9b6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('broadcast_receipts',
+                  sa.Column('is_deleted', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('broadcast_receipts', 'is_deleted')
@@ -0,0 +1,38 @@
+"""Shard quiz_last_attempts next_due_at index by user_id
+
+Revision ID: b91d4e6f0a3c
+Revises: f2a7c3d9e1b4
+Create Date: 2026-10-19 11:26:05.193847
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b91d4e6f0a3c'
+down_revision: Union[str, None] = 'f2a7c3d9e1b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match REMINDER_SHARDS in app/db/models.py when this revision is applied.
+REMINDER_SHARDS = 4
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_quiz_last_attempts_shard_next_due_at_id', 'quiz_last_attempts',
+                        [sa.text(f'(user_id % {REMINDER_SHARDS})'), 'next_due_at', 'id'],
+                        unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_quiz_last_attempts_next_due_at_id', table_name='quiz_last_attempts', if_exists=True,
+                      postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_quiz_last_attempts_next_due_at_id', 'quiz_last_attempts', ['next_due_at', 'id'],
+                        unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_quiz_last_attempts_shard_next_due_at_id', table_name='quiz_last_attempts',
+                      if_exists=True, postgresql_concurrently=True)
@@ -1,13 +1,17 @@
 import pytest
 from httpx import AsyncClient, ASGITransport
 
+from app.db.connect_redis import init_redis_pool, close_redis_pool
 from app.main import app
 from unittest.mock import MagicMock
 
 
 @pytest.fixture
-def client():
-    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+async def client():
+    # ASGITransport does not run the lifespan, so open the Redis pool it would.
+    init_redis_pool()
+    yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    await close_redis_pool()
 
 
 @pytest.fixture
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+
+
+SEED_STATEMENTS = [
+    """INSERT INTO users (id, username, email, hashed_password, is_admin)
+       SELECT 900000 + i, 'explain_user_' || i, 'explain_user_' || i || '@example.com', 'x', false
+       FROM generate_series(1, 500) AS i""",
+    """INSERT INTO companies (id, company_name, description, visibility)
+       SELECT 900000 + i, 'explain_company_' || i, 'description', 'PUBLIC'
+       FROM generate_series(1, 50) AS i""",
+    """INSERT INTO company_members (user_id, company_id, role)
+       SELECT 900000 + u, 900000 + c, CASE WHEN u % 50 = 0 THEN 'OWNER'::role ELSE 'MEMBER'::role END
+       FROM generate_series(1, 500) AS u, generate_series(1, 50) AS c
+       WHERE (u + c) % 5 = 0""",
+    """INSERT INTO quizzes (id, title, frequency_days, company_id)
+       SELECT 900000 + i, 'explain_quiz_' || i, 1, 900000 + (i % 50) + 1
+       FROM generate_series(1, 200) AS i""",
+    """INSERT INTO quiz_results (user_id, quiz_id, company_id, score, total_correct_answers,
+                                total_questions_answered, solved_at)
+       SELECT 900000 + (i % 500) + 1, 900000 + (i % 200) + 1, 900000 + (i % 50) + 1, 50, 1, 2, now()
+       FROM generate_series(1, 20000) AS i""",
+    """INSERT INTO notifications (user_id, status, message, created_at)
+       SELECT 900000 + (i % 500) + 1, CASE WHEN i % 3 = 0 THEN 'READ'::notification_status
+                                           ELSE 'UNREAD'::notification_status END, 'message', now()
+       FROM generate_series(1, 20000) AS i""",
+    """INSERT INTO invites (user_id, company_id, status, type_invite)
+       SELECT 900000 + (i % 500) + 1, 900000 + (i % 50) + 1, 'REQUEST', 'INVITE'
+       FROM generate_series(1, 5000) AS i""",
+    """INSERT INTO quiz_last_attempts (user_id, quiz_id, last_attempt_at, next_due_at)
+       SELECT 900000 + (i % 500) + 1, 900000 + (i / 500) + 1, now(), now() + make_interval(days => i % 30 - 15)
+       FROM generate_series(0, 19999) AS i""",
+    "ANALYZE users, companies, company_members, quizzes, quiz_results, notifications, invites, quiz_last_attempts",
+]
+
+
+@pytest.fixture(scope="module")
+def seeded_connection():
+    engine = create_engine(settings.SQL_URL)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        for statement in SEED_STATEMENTS:
+            connection.execute(text(statement))
+        yield connection
+        transaction.rollback()
+    engine.dispose()
+
+
+def explain(connection, query: str) -> str:
+    plan = connection.execute(text(f"EXPLAIN {query}")).scalars().all()
+    return "\n".join(plan)
+
+
+@pytest.mark.parametrize("query, index_name", [
+    ("SELECT * FROM quiz_results WHERE user_id = 900010 AND quiz_id = 900009",
+     "ix_quiz_results_user_id_quiz_id"),
+    ("SELECT * FROM quiz_results WHERE company_id = 900010 AND quiz_id = 900009",
+     "ix_quiz_results_company_id_quiz_id"),
+    ("SELECT * FROM quiz_results WHERE company_id = 900010 AND user_id = 900009",
+     "ix_quiz_results_company_id_user_id"),
+    ("SELECT role FROM company_members WHERE company_id = 900010 AND user_id = 900010",
+     "ix_company_members_company_id_user_id"),
+    ("SELECT * FROM company_members WHERE user_id = 900050 AND role = 'OWNER'",
+     "ix_company_members_user_id_role"),
+    ("SELECT count(*) FROM notifications WHERE user_id = 900010 AND status = 'UNREAD'",
+     "ix_notifications_user_id_id_unread"),
+    ("SELECT * FROM notifications WHERE user_id = 900010 AND id < 2000000000 ORDER BY id DESC LIMIT 10",
+     "ix_notifications_user_id_id"),
+    ("SELECT * FROM notifications WHERE user_id = 900010 AND status = 'UNREAD' AND id < 2000000000 "
+     "ORDER BY id DESC LIMIT 10",
+     "ix_notifications_user_id_id_unread"),
+    ("SELECT * FROM quiz_last_attempts WHERE user_id % 4 = 1 AND next_due_at <= now() - interval '14 days' "
+     "ORDER BY next_due_at, id LIMIT 100",
+     "ix_quiz_last_attempts_shard_next_due_at_id"),
+    ("SELECT * FROM invites WHERE user_id = 900010 AND type_invite = 'INVITE'",
+     "ix_invites_user_id_type_invite"),
+])
+def test_planner_uses_composite_index(seeded_connection, query, index_name):
+    assert index_name in explain(seeded_connection, query)
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock
 
+from app.db.connect_redis import get_redis_connection
+
 
 @pytest.mark.asyncio
 async def test_health_check(client, mocker):
@@ -23,3 +25,9 @@ async def test_create_user(client, mocker):
     assert response.status_code == 201
     assert response.json()["username"] == user_data["username"]
     assert response.json()["email"] == user_data["email"]
+
+
+@pytest.mark.asyncio
+async def test_redis_connection_requires_the_pool_from_startup():
+    with pytest.raises(RuntimeError):
+        await get_redis_connection()
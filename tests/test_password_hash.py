@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services import password_hash
+from app.services.password_hash import PasswordHasher
+
+
+LOGIN_STORM_SIZE = settings.PASSWORD_HASH_WORKERS * 3
+
+
+class BlockingHasher:
+    """Stands in for bcrypt: holds its thread until released and records where it ran."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.thread_names = set()
+        self.running = 0
+        self.max_running = 0
+
+    def verify(self, plain_password, hashed_password):
+        with self.lock:
+            self.thread_names.add(threading.current_thread().name)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.release.wait(timeout=10)
+        with self.lock:
+            self.running -= 1
+        return plain_password == hashed_password
+
+
+@pytest.fixture
+def blocking_hasher(monkeypatch):
+    hasher = BlockingHasher()
+    monkeypatch.setattr(password_hash.pwd_context, "verify", hasher.verify)
+    yield hasher
+    hasher.release.set()
+
+
+async def wait_for_running(hasher: BlockingHasher, count: int):
+    for _ in range(500):
+        if hasher.running == count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"expected {count} running verifications, got {hasher.running}")
+
+
+async def test_login_storm_runs_on_bounded_pool_while_event_loop_serves_requests(client, blocking_hasher):
+    storm = [asyncio.create_task(PasswordHasher.verify_password("password", "password"))
+             for _ in range(LOGIN_STORM_SIZE)]
+    await wait_for_running(blocking_hasher, settings.PASSWORD_HASH_WORKERS)
+
+    async with client:
+        response = await client.get("/")
+        stats = (await client.get("/health/password-hasher")).json()
+
+    assert response.status_code == 200
+    assert stats["in_flight"] == LOGIN_STORM_SIZE
+    assert stats["queue_depth"] == LOGIN_STORM_SIZE - settings.PASSWORD_HASH_WORKERS
+
+    blocking_hasher.release.set()
+    assert all(await asyncio.gather(*storm))
+    assert blocking_hasher.max_running == settings.PASSWORD_HASH_WORKERS
+    assert all(name.startswith("password-hash") for name in blocking_hasher.thread_names)
+    assert PasswordHasher.get_queue_depth() == 0 and PasswordHasher.in_flight == 0
+
+
+async def test_password_checks_are_shed_once_the_queue_is_full(monkeypatch, blocking_hasher):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_QUEUE", 2)
+    accepted = [asyncio.create_task(PasswordHasher.verify_password("password", "password"))
+                for _ in range(settings.PASSWORD_HASH_WORKERS + 2)]
+    await wait_for_running(blocking_hasher, settings.PASSWORD_HASH_WORKERS)
+
+    with pytest.raises(HTTPException) as error:
+        await PasswordHasher.verify_password("password", "password")
+    assert error.value.status_code == 503
+
+    blocking_hasher.release.set()
+    assert all(await asyncio.gather(*accepted))
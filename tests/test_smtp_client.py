@@ -0,0 +1,186 @@
+import datetime
+import socket
+import ssl
+
+import aioredis
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from app.core.config import settings
+from app.db.connect_redis import init_redis_pool, close_redis_pool
+from app.utils import tasks
+from app.utils.celery_app import run_in_worker_loop
+from app.utils.smtp_client import SMTPConnectionPool
+from app.utils.tasks import send_emails_batch
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.peers = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.peers.add(session.peer)
+        self.messages.append(envelope.rcpt_tos)
+        return "250 OK"
+
+
+def accept_any_login(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=True)
+
+
+@pytest.fixture(scope="module")
+def tls_context(tmp_path_factory):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    directory = tmp_path_factory.mktemp("smtp")
+    (directory / "cert.pem").write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    (directory / "key.pem").write_bytes(key.private_bytes(serialization.Encoding.PEM,
+                                                          serialization.PrivateFormat.TraditionalOpenSSL,
+                                                          serialization.NoEncryption()))
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(directory / "cert.pem", directory / "key.pem")
+    return context
+
+
+def get_free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class LocalSMTPServer:
+    """aiosmtpd stand-in for the mail provider: STARTTLS, any login accepted, messages recorded."""
+
+    def __init__(self, tls_context: ssl.SSLContext):
+        self.tls_context = tls_context
+        self.handler = RecordingHandler()
+        self.port = get_free_port()
+        self.controller = None
+
+    def start(self):
+        self.controller = Controller(self.handler, hostname="127.0.0.1", port=self.port,
+                                     tls_context=self.tls_context, authenticator=accept_any_login,
+                                     auth_require_tls=True)
+        self.controller.start()
+
+    def stop(self):
+        self.controller.stop()
+
+    def restart(self):
+        """Drop every open session, the way a provider closes idle connections."""
+        self.stop()
+        self.start()
+
+
+@pytest.fixture
+def smtp_server(tls_context, monkeypatch):
+    server = LocalSMTPServer(tls_context)
+    server.start()
+    monkeypatch.setattr(settings, "GMAIL_HOST", "127.0.0.1")
+    monkeypatch.setattr(settings, "GMAIL_PORT", server.port)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def worker_redis_pool():
+    # Opened by worker_process_init in a real worker; tasks called inline need it too.
+    init_redis_pool()
+    yield
+    run_in_worker_loop(close_redis_pool())
+
+
+def test_pool_reuses_authenticated_session(smtp_server):
+    pool = SMTPConnectionPool(max_idle=1)
+
+    for recipient in ("first@example.com", "second@example.com", "third@example.com"):
+        with pool.connection() as client:
+            client.send_email(to_email=recipient, content="Time to retake the quiz")
+    pool.close()
+
+    assert smtp_server.handler.messages == [["first@example.com"], ["second@example.com"], ["third@example.com"]]
+    assert len(smtp_server.handler.peers) == 1
+
+
+def test_pool_reconnects_after_server_disconnect(smtp_server):
+    pool = SMTPConnectionPool(max_idle=1)
+
+    with pool.connection() as client:
+        client.send_email(to_email="first@example.com", content="Time to retake the quiz")
+    smtp_server.restart()
+    with pool.connection() as client:
+        client.send_email(to_email="second@example.com", content="Time to retake the quiz")
+    pool.close()
+
+    assert smtp_server.handler.messages == [["first@example.com"], ["second@example.com"]]
+    assert len(smtp_server.handler.peers) == 2
+
+
+class RejectingHandler(RecordingHandler):
+    """Refuses some recipients permanently and some temporarily, like a throttling provider."""
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("unknown"):
+            return "550 No such user"
+        if address.startswith("busy"):
+            return "451 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+
+def test_batch_reports_each_recipient_and_retries_only_temporary_failures(smtp_server, worker_redis_pool, monkeypatch):
+    smtp_server.handler = RejectingHandler()
+    smtp_server.restart()
+    scheduled = []
+    monkeypatch.setattr(send_emails_batch, "apply_async", lambda args, kwargs, countdown: scheduled.append(args))
+    recipients = [{"email": email, "username": "user", "message_text": "Time to retake the quiz"}
+                  for email in ("first@example.com", "unknown@example.com", "busy@example.com", "last@example.com")]
+
+    report = send_emails_batch(recipients)
+
+    assert report["sent"] == ["first@example.com", "last@example.com"]
+    assert [(failure["email"], failure["permanent"]) for failure in report["failed"]] == [
+        ("unknown@example.com", True), ("busy@example.com", False)
+    ]
+    assert report["retry_scheduled"]
+    assert scheduled == [([recipients[2]],)]
+    assert len(smtp_server.handler.peers) == 1
+
+
+def test_batch_defers_unsent_recipients_when_rate_limiter_is_unreachable(smtp_server, monkeypatch):
+    tokens = iter([None, aioredis.ConnectionError("Redis is down")])
+
+    def take_token_or_fail():
+        error = next(tokens)
+        if error:
+            raise error
+
+    scheduled = []
+    monkeypatch.setattr(tasks, "wait_for_email_token", take_token_or_fail)
+    monkeypatch.setattr(send_emails_batch, "apply_async", lambda args, kwargs, countdown: scheduled.append(args))
+    recipients = [{"email": email, "username": "user", "message_text": "Time to retake the quiz"}
+                  for email in ("first@example.com", "second@example.com", "third@example.com")]
+
+    report = send_emails_batch(recipients)
+
+    assert report["sent"] == ["first@example.com"]
+    assert [failure["email"] for failure in report["failed"]] == ["second@example.com", "third@example.com"]
+    assert scheduled == [(recipients[1:],)]
+    assert smtp_server.handler.messages == [["first@example.com"]]
@@ -0,0 +1,71 @@
+import time
+
+import aioredis
+import pytest
+
+from app.db.connect_redis import init_redis_pool, close_redis_pool, get_redis_connection
+from app.redis_workflow.token_invalidation import bump_user_generation
+from app.services import token_cache as token_cache_module
+from app.services.token_cache import TokenCache, UserSnapshot
+
+
+@pytest.fixture
+async def redis():
+    # Pooled connections belong to the event loop that opened them, and each test runs its own.
+    init_redis_pool()
+    yield await get_redis_connection()
+    await close_redis_pool()
+
+
+def make_user(user_id: int) -> UserSnapshot:
+    return UserSnapshot(id=user_id, username=f"user{user_id}", email=f"cache_user{user_id}@example.com",
+                        is_admin=False)
+
+
+async def cache_token(cache: TokenCache, redis, user_id: int, exp: float = None):
+    user = make_user(user_id)
+    generation = await cache.get_generation(redis, user.email)
+    cache.put(f"token-{user_id}", generation, {"exp": exp or time.time() + 60}, user)
+
+
+async def test_token_cache_evicts_least_recently_used_and_expired_tokens(redis):
+    cache = TokenCache(max_size=2)
+    await cache_token(cache, redis, 1)
+    await cache_token(cache, redis, 2)
+    assert (await cache.get(redis, "token-1")).user.id == 1
+
+    await cache_token(cache, redis, 3)
+    assert await cache.get(redis, "token-2") is None
+    assert await cache.get(redis, "token-1") is not None and await cache.get(redis, "token-3") is not None
+
+    await cache_token(cache, redis, 4, exp=time.time() - 1)
+    assert await cache.get(redis, "token-4") is None
+
+
+async def test_token_cache_drops_users_changed_by_any_process(redis):
+    cache = TokenCache(max_size=10)
+    await cache_token(cache, redis, 5)
+    await cache_token(cache, redis, 6)
+
+    await bump_user_generation(redis, make_user(5).email)
+    assert await cache.get(redis, "token-5") is None
+    assert await cache.get(redis, "token-6") is not None
+
+    stale_generation = await cache.get_generation(redis, make_user(6).email)
+    await bump_user_generation(redis, make_user(6).email)
+    cache.put("token-6", stale_generation, {"exp": time.time() + 60}, make_user(6))
+    assert await cache.get(redis, "token-6") is None
+
+
+async def test_token_cache_fails_closed_without_redis(redis, monkeypatch):
+    cache = TokenCache(max_size=10)
+    await cache_token(cache, redis, 7)
+
+    async def unreachable(redis, email):
+        raise aioredis.ConnectionError("Redis is down")
+
+    monkeypatch.setattr(token_cache_module, "get_user_generation", unreachable)
+    assert await cache.get(redis, "token-7") is None
+    assert not cache.entries
+    await cache_token(cache, redis, 7)
+    assert not cache.entries